@@ -1,7 +1,7 @@
 """
 OAuth endpoints for social media platform authentication
 """
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from fastapi.responses import RedirectResponse
 from typing import Optional
 import logging
@@ -14,13 +14,18 @@ from app.models.social_auth_models import SocialAccount, PlatformType
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/oauth", tags=["OAuth Authentication"])
-oauth_service = OAuthService()
+
+
+def get_oauth_service(request: Request) -> OAuthService:
+    """Dependency returning the OAuthService created in the application lifespan"""
+    return request.app.state.oauth_service
 
 
 @router.get("/connect/{platform}")
 async def connect_platform(
     platform: str,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    oauth_service: OAuthService = Depends(get_oauth_service)
 ):
     """Initiate OAuth flow for a social media platform"""
     try:
@@ -38,7 +43,8 @@ async def oauth_callback(
     platform: str,
     code: str = Query(...),
     state: str = Query(...),
-    error: Optional[str] = Query(None)
+    error: Optional[str] = Query(None),
+    oauth_service: OAuthService = Depends(get_oauth_service)
 ):
     """Handle OAuth callback from social media platform"""
     if error:
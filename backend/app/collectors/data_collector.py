@@ -3,20 +3,31 @@ Data collection service for gathering social media data.
 This service collects data and properly links it to users.
 """
 
+import asyncio
+import logging
+import re
+from collections import defaultdict
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import random
 from beanie import PydanticObjectId
+from beanie.operators import In
+from pymongo.errors import BulkWriteError
 
 from app.models.mongo_models import (
     User, SocialMediaPost, ThreatDetection, 
     PlatformEnum, ThreatLevelEnum, SeverityEnum
 )
 
+logger = logging.getLogger(__name__)
+
 
 class DataCollectorService:
     """Service for collecting social media data and analyzing threats."""
     
+    # Batches of detected threats that can wait to be saved before callers block
+    THREAT_QUEUE_SIZE = 100
+    
     def __init__(self):
         # Mock data for different platforms
         self.mock_posts = {
@@ -87,6 +98,54 @@ class DataCollectorService:
             "hacker": {"type": "attack", "base_score": 0.3},
             "cybersecurity": {"type": "vulnerability", "base_score": 0.2}
         }
+        
+        # All keywords in one alternation with a named group per threat type,
+        # so each post is scanned once and matches arrive already grouped
+        keywords_by_type = defaultdict(list)
+        for keyword, threat_info in self.threat_keywords.items():
+            keywords_by_type[threat_info["type"]].append(keyword)
+        self._threat_keyword_re = re.compile("|".join(
+            f"(?P<{threat_type}>" + "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True)) + ")"
+            for threat_type, keywords in keywords_by_type.items()
+        ))
+        
+        # Threats are detected inline (keyword matching is cheap) but saved out
+        # of band: detected threats are queued and a single worker task writes
+        # them after the request has returned. The queue is bounded so a slow
+        # database applies backpressure instead of growing memory
+        self._threat_queue: asyncio.Queue = asyncio.Queue(maxsize=self.THREAT_QUEUE_SIZE)
+        self._threat_worker: Optional[asyncio.Task] = None
+    
+    def _ensure_threat_worker(self):
+        """Start the threat saving worker if it is not running"""
+        if self._threat_worker is None or self._threat_worker.done():
+            self._threat_worker = asyncio.create_task(self._run_threat_worker())
+    
+    async def _run_threat_worker(self):
+        """Consume queued threats and save them in one bulk write per batch"""
+        while True:
+            threats, user = await self._threat_queue.get()
+            try:
+                await ThreatDetection.insert_many(threats, ordered=False)
+            except BulkWriteError as e:
+                logger.error(f"Error saving threats for user {user.username}: {e.details.get('writeErrors')}")
+            except Exception as e:
+                logger.error(f"Error saving threats for user {user.username}: {e}")
+            finally:
+                self._threat_queue.task_done()
+    
+    async def aclose(self):
+        """Save any queued threats, then stop the worker (called on application shutdown)"""
+        if not self._threat_queue.empty():
+            self._ensure_threat_worker()
+            await self._threat_queue.join()
+        if self._threat_worker and not self._threat_worker.done():
+            self._threat_worker.cancel()
+            try:
+                await self._threat_worker
+            except asyncio.CancelledError:
+                pass
+        self._threat_worker = None
     
     async def collect_data_for_user(self, user: User) -> Dict[str, Any]:
         """
@@ -102,22 +161,46 @@ class DataCollectorService:
             }
         
         collected_posts = []
-        detected_threats = []
         
-        # Collect data from each enabled platform
-        for platform in user.enabled_platforms:
-            platform_posts = await self._collect_platform_data(platform, user)
-            collected_posts.extend(platform_posts)
+        # Platforms are independent, so collect them concurrently
+        results = await asyncio.gather(
+            *(self._collect_platform_data(platform, user) for platform in user.enabled_platforms),
+            return_exceptions=True
+        )
+        
+        for platform, platform_posts in zip(user.enabled_platforms, results):
+            if isinstance(platform_posts, Exception):
+                logger.error(f"Error collecting {platform.value} data for user {user.username}: {platform_posts}")
+                continue
             
-            # Analyze threats for each post
-            for post in platform_posts:
-                threats = await self._analyze_threats(post, user)
-                detected_threats.extend(threats)
+            collected_posts.extend(platform_posts)
+        
+        posts_collected = len(collected_posts)
+        
+        # Save all new posts in one bulk write instead of one round-trip per post
+        if collected_posts:
+            try:
+                await SocialMediaPost.insert_many(collected_posts, ordered=False)
+            except BulkWriteError as e:
+                write_errors = e.details.get("writeErrors", [])
+                logger.error(f"Error saving posts for user {user.username}: {write_errors}")
+                # Only analyze posts that were stored, so threats never reference missing posts
+                failed = {error["index"] for error in write_errors}
+                collected_posts = [post for i, post in enumerate(collected_posts) if i not in failed]
+        
+        detected_threats = []
+        for post in collected_posts:
+            detected_threats.extend(self._analyze_threats(post, user))
+        
+        # Queue the threats for saving instead of writing them inline
+        if detected_threats:
+            self._ensure_threat_worker()
+            await self._threat_queue.put((detected_threats, user))
         
         return {
             "status": "success",
             "message": f"Data collection completed for user {user.username}",
-            "posts_collected": len(collected_posts),
+            "posts_collected": posts_collected,
             "threats_detected": len(detected_threats),
             "platforms": [p.value for p in user.enabled_platforms],
             "user_id": str(user.id)
@@ -128,29 +211,37 @@ class DataCollectorService:
         posts = []
         mock_data = self.mock_posts.get(platform, [])
         
-        for post_data in mock_data:
-            # Create unique post_id for this user to avoid conflicts
-            unique_post_id = f"{post_data['post_id']}_{str(user.id)[-6:]}"
-            
-            # Check if we already collected this post for this user
-            existing_post = await SocialMediaPost.find_one(
-                SocialMediaPost.post_id == unique_post_id,
-                SocialMediaPost.collected_by == user.id
-            )
-            
-            if existing_post:
+        user_id = user.id
+        now = datetime.utcnow()
+        
+        # Create unique post_ids for this user to avoid conflicts
+        user_suffix = str(user_id)[-6:]
+        unique_post_ids = [f"{post_data['post_id']}_{user_suffix}" for post_data in mock_data]
+        
+        # Check which posts we already collected for this user in a single query
+        existing_posts = await SocialMediaPost.find(
+            In(SocialMediaPost.post_id, unique_post_ids),
+            SocialMediaPost.collected_by == user_id
+        ).to_list()
+        existing_post_ids = {post.post_id for post in existing_posts}
+        
+        for post_data, unique_post_id in zip(mock_data, unique_post_ids):
+            if unique_post_id in existing_post_ids:
                 continue  # Skip if already collected
             
-            # Create new post linked to this user
-            post = SocialMediaPost(
+            # Create new post linked to this user; the id is assigned up front so
+            # threats can reference it before the batch is inserted. The fields
+            # are built here with the right types, so validation is skipped
+            post = SocialMediaPost.model_construct(
+                id=PydanticObjectId(),
                 platform=platform,
                 post_id=unique_post_id,
                 author=post_data["author"],
                 content=post_data["content"],
                 url=post_data["url"],
-                posted_at=datetime.utcnow() - timedelta(hours=random.randint(1, 24)),
-                collected_at=datetime.utcnow(),
-                collected_by=user.id,  # 🔑 THIS IS THE KEY - Link to user!
+                posted_at=now - timedelta(hours=random.randint(1, 24)),
+                collected_at=now,
+                collected_by=user_id,  # 🔑 THIS IS THE KEY - Link to user!
                 engagement_metrics={
                     "likes": random.randint(10, 1000),
                     "shares": random.randint(1, 100),
@@ -161,56 +252,62 @@ class DataCollectorService:
                 comments_count=random.randint(0, 50)
             )
             
-            await post.save()
             posts.append(post)
         
         return posts
     
-    async def _analyze_threats(self, post: SocialMediaPost, user: User) -> List[ThreatDetection]:
+    def _analyze_threats(self, post: SocialMediaPost, user: User) -> List[ThreatDetection]:
         """Analyze a post for potential threats and link to user."""
         threats = []
         content_lower = post.content.lower()
         
-        matched_keywords = []
-        total_score = 0.0
-        threat_types = set()
+        # Check for threat keywords, bucketed by threat type
+        matches_by_type = defaultdict(set)
+        for match in self._threat_keyword_re.finditer(content_lower):
+            matches_by_type[match.lastgroup].add(match.group())
         
-        # Check for threat keywords
-        for keyword, threat_info in self.threat_keywords.items():
-            if keyword in content_lower:
-                matched_keywords.append(keyword)
-                total_score += threat_info["base_score"]
-                threat_types.add(threat_info["type"])
+        if not matches_by_type:
+            return threats
+        
+        threat_types = set(matches_by_type)
+        found = set().union(*matches_by_type.values())
+        matched_keywords = [keyword for keyword in self.threat_keywords if keyword in found]
+        total_score = sum(self.threat_keywords[keyword]["base_score"] for keyword in matched_keywords)
+        
+        # Confidence and severity depend only on the total score, so they are
+        # the same for every threat type found in this post
+        confidence_score = min(total_score, 1.0)  # Cap at 1.0
+        
+        # Determine severity based on confidence
+        if confidence_score >= 0.8:
+            severity = "critical"
+        elif confidence_score >= 0.6:
+            severity = "high"
+        elif confidence_score >= 0.3:
+            severity = "medium"
+        else:
+            severity = "low"
+        
+        description = f"Potential {severity} threat detected in {post.platform.value} post"
+        post_id = str(post.id)
+        detected_at = datetime.utcnow()
         
         # Create threat detection for each type found
         for threat_type in threat_types:
-            confidence_score = min(total_score, 1.0)  # Cap at 1.0
-            
-            # Determine severity based on confidence
-            if confidence_score >= 0.8:
-                severity = "critical"
-            elif confidence_score >= 0.6:
-                severity = "high"
-            elif confidence_score >= 0.3:
-                severity = "medium"
-            else:
-                severity = "low"
-            
-            threat = ThreatDetection(
+            threat = ThreatDetection.model_construct(
                 platform=post.platform,
-                post_id=str(post.id),
+                post_id=post_id,
                 threat_type=threat_type,
                 confidence_score=confidence_score,
                 severity=severity,
-                description=f"Potential {severity} threat detected in {post.platform.value} post",
+                description=description,
                 detection_method="keyword_matching",
-                detected_at=datetime.utcnow(),
+                detected_at=detected_at,
                 detected_by=user.id,  # 🔑 Link threat to user!
                 keywords_matched=matched_keywords,
                 source_url=post.url
             )
             
-            await threat.save()
             threats.append(threat)
         
         return threats
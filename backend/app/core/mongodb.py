@@ -11,7 +11,11 @@ from app.core.config import get_settings
 from app.models.mongo_models import User
 from app.models.social_auth_models import (
     SocialAccount,
-    OAuthState
+    OAuthState,
+    CollectedPost,
+    CollectedConnection,
+    CollectedInteraction,
+    SearchHistory
 )
 
 logger = logging.getLogger(__name__)
@@ -110,8 +114,11 @@ async def connect_to_mongo():
         try:
             logger.info(f"Connection attempt {i+1}/{len(connection_attempts)}")
             
-            # Create motor client
-            mongodb.client = AsyncIOMotorClient(attempt["url"], **attempt["options"])
+            # Create motor client; wire compression shrinks the bulk writes of
+            # text-heavy collected posts (zlib ships with Python, level 1 is cheap)
+            mongodb.client = AsyncIOMotorClient(
+                attempt["url"], compressors="zlib", zlibCompressionLevel=1, **attempt["options"]
+            )
             
             # Get database - if database name is in URL, use it; otherwise use settings
             db_name = settings.db_name if hasattr(settings, 'db_name') else 'osint_platform'
@@ -130,6 +137,8 @@ async def connect_to_mongo():
             
             logger.info(f"✅ Connected to MongoDB: {settings.db_name if hasattr(settings, 'db_name') else 'osint_platform'} (Attempt {i+1})")
             
+            await migrate_oauth_state_indexes(mongodb.database)
+            
             # Initialize Beanie ODM
             logger.info("Initializing Beanie ODM...")
             try:
@@ -139,6 +148,10 @@ async def connect_to_mongo():
                         User,
                         SocialAccount,
                         OAuthState,
+                        CollectedPost,
+                        CollectedConnection,
+                        CollectedInteraction,
+                        SearchHistory,
                     ]
                 )
                 logger.info("✅ Beanie ODM initialized successfully")
@@ -146,6 +159,8 @@ async def connect_to_mongo():
                 logger.error(f"❌ Beanie ODM initialization failed: {beanie_error}")
                 raise
             
+            await ensure_unique_indexes(mongodb.database)
+            
             return True
             
         except Exception as e:
@@ -164,6 +179,44 @@ async def connect_to_mongo():
     return False
 
 
+async def migrate_oauth_state_indexes(database):
+    """Drop the plain expires_at index that the OAuthState TTL index replaces.
+
+    Must run before init_beanie, which otherwise fails creating a TTL index
+    on the same key. A no-op once the old index is gone.
+    """
+    try:
+        indexes = await database["oauth_states"].index_information()
+        old_index = indexes.get("expires_at_1")
+        if old_index and "expireAfterSeconds" not in old_index:
+            await database["oauth_states"].drop_index("expires_at_1")
+            logger.info("Dropped non-TTL expires_at index on oauth_states")
+    except Exception as e:
+        logger.warning(f"Could not migrate oauth_states indexes: {type(e).__name__}: {str(e)}")
+
+
+# collection -> key of a unique index that dedups its documents at write time
+UNIQUE_INDEXES = [
+    ("social_media_posts", [("platform", 1), ("post_id", 1)]),
+    ("social_media_relationships",
+     [("platform", 1), ("relationship_type", 1), ("source_username", 1), ("target_username", 1)]),
+    # Natural keys the OAuth collector upserts re-synced posts and connections on
+    ("collected_posts", [("social_account_id", 1), ("platform", 1), ("platform_post_id", 1)]),
+    ("collected_connections", [("social_account_id", 1), ("platform", 1), ("platform_user_id", 1)]),
+]
+
+
+async def ensure_unique_indexes(database):
+    """Declare unique indexes so MongoDB rejects duplicate documents at write time"""
+    for collection, keys in UNIQUE_INDEXES:
+        try:
+            await database[collection].create_index(keys, unique=True)
+        except Exception as e:
+            # Existing duplicates prevent index creation; the app still works without it
+            logger.warning(f"Could not create unique index on {collection}: {type(e).__name__}: {str(e)}")
+    logger.info("✅ Unique indexes ensured")
+
+
 async def close_mongo_connection():
     """Close database connection"""
     if mongodb.client:
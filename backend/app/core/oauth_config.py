@@ -24,6 +24,9 @@ class OAuthSettings(BaseSettings):
     TWITTER_CLIENT_ID: str = ""
     TWITTER_CLIENT_SECRET: str = ""
     TWITTER_REDIRECT_URI: str = "http://localhost:8001/api/v1/oauth/twitter/callback"
+    
+    # YouTube Data API
+    YOUTUBE_API_KEY: str = ""
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,28 @@
+"""
+Timestamp parsing shared by the data collectors.
+"""
+
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Optional
+
+
+@lru_cache(maxsize=1024)
+def _parse_iso(value: str) -> datetime:
+    # Python 3.11+ accepts a trailing "Z", so no string rewriting is needed
+    return datetime.fromisoformat(value)
+
+
+def parse_timestamp(value: Any, default: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Parse a platform timestamp (Unix epoch number or ISO 8601 string).
+    Returns default when the value is missing or cannot be parsed.
+    """
+    if value is None or value == "":
+        return default
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value)
+    try:
+        return _parse_iso(value)
+    except (TypeError, ValueError):
+        return default
@@ -17,6 +17,9 @@ from app.core.mongodb import connect_to_mongo, close_mongo_connection, ping_data
 from app.core.security import SecurityHeaders, generate_correlation_id, log_security_event
 from app.api.v1.api import api_router
 from app.models.mongo_models import User
+from app.services.oauth_data_collector import oauth_data_collector
+from app.services.oauth_service import OAuthService
+from app.collectors.data_collector import data_collector
 from passlib.context import CryptContext
 
 # Password hashing for default user
@@ -37,6 +40,9 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info(f"Starting {settings.app_name} v{settings.version}")
     
+    # Created here so its HTTP client belongs to this worker's event loop
+    app.state.oauth_service = OAuthService()
+    
     try:
         # Initialize MongoDB connection
         logger.info("Attempting MongoDB connection...")
@@ -67,6 +73,9 @@ async def lifespan(app: FastAPI):
             logger.warning("⚠️  MongoDB connection failed, starting in limited mode")
             # Allow server to start without MongoDB for debugging
         
+        # Open the shared collector HTTP session so the first sync doesn't pay for it
+        await oauth_data_collector.startup(app.state.oauth_service)
+        
         # Additional services can be initialized here if needed
         logger.info("All core services initialized successfully")
         
@@ -81,6 +90,10 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Application shutdown initiated")
+    # oauth_service first: it cancels collections still using the collector's session
+    await app.state.oauth_service.aclose()
+    await oauth_data_collector.aclose()
+    await data_collector.aclose()
     await close_mongo_connection()
     logger.info("Application shutdown completed")
 
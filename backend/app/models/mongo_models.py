@@ -104,7 +104,7 @@ class SocialMediaPost(Document):
     class Settings:
         name = "social_media_posts"
         indexes = [
-            [("platform", 1), ("post_id", 1)],  # Compound index for uniqueness
+            [("platform", 1), ("post_id", 1)],  # Unique index created in ensure_unique_indexes
             [("posted_at", -1)],  # Index for time-based queries
             [("threat_level", 1)],
             [("collected_at", -1)],
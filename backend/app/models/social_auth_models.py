@@ -2,6 +2,7 @@
 MongoDB models for social media authentication and data collection
 """
 from beanie import Document
+from pymongo import IndexModel
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, List, Any
 from datetime import datetime
@@ -54,6 +55,10 @@ class SocialAccount(Document):
             "user_id",
             "platform",
             ("user_id", "platform"),
+            # Serves the per-sync lookup of a user's active accounts
+            IndexModel([("user_id", 1), ("is_active", 1)]),
+            # Serves the existing-account lookup on every OAuth callback
+            IndexModel([("user_id", 1), ("platform", 1), ("platform_user_id", 1)]),
         ]
 
 class PostComment(BaseModel):
@@ -121,7 +126,6 @@ class CollectedPost(Document):
             "user_id",
             "platform",
             "social_account_id",
-            ("platform", "platform_post_id"),
             "created_at",
         ]
 
@@ -159,7 +163,6 @@ class CollectedConnection(Document):
             "user_id",
             "platform",
             "social_account_id",
-            ("platform", "platform_user_id"),
         ]
 
 class CollectedInteraction(Document):
@@ -247,8 +250,10 @@ class OAuthState(Document):
     class Settings:
         name = "oauth_states"
         indexes = [
-            "state",
-            "expires_at",
+            # Covers the state verification lookup
+            IndexModel([("state", 1), ("platform", 1), ("is_used", 1)]),
+            # MongoDB deletes states as soon as they expire
+            IndexModel([("expires_at", 1)], expireAfterSeconds=0),
         ]
 
 class SearchHistory(Document):
@@ -5,7 +5,7 @@ Contains business logic and data processing services.
 
 from .apify_collector import ApifyCollector
 from .facebook_graph_api_collector import FacebookGraphAPICollector
-from .oauth_service import OAuthService, oauth_service
+from .oauth_service import OAuthService
 from .oauth_data_collector import OAuthDataCollector, oauth_data_collector
 from .credential_service import CredentialService
 from .credential_vault_service import CredentialVaultService, credential_vault
@@ -14,7 +14,7 @@ from .twitter_api_io_collector import TwitterApiIOCollector
 __all__ = [
     "ApifyCollector",
     "FacebookGraphAPICollector",
-    "OAuthService", "oauth_service",
+    "OAuthService",
     "OAuthDataCollector", "oauth_data_collector",
     "CredentialService",
     "CredentialVaultService", "credential_vault",
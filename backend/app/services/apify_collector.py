@@ -5,83 +5,214 @@ Uses Apify actors for scraping various platforms
 
 import asyncio
 import logging
-from typing import List, Dict, Optional
+import os
+from typing import Callable, List, Dict, Optional, Set
 from datetime import datetime
 
 from apify_client import ApifyClient
+from cachetools import TTLCache
+from pymongo.errors import BulkWriteError
 
 from app.models.mongo_models import SocialMediaPost, PlatformEnum
 from app.core.mongodb import get_database
+from app.core.timeutils import parse_timestamp
 
 logger = logging.getLogger(__name__)
 
+DUPLICATE_KEY_ERROR = 11000
+
+# Platform string value for either an enum member or its raw value; a plain
+# dict lookup avoids re-running PlatformEnum(...) for every saved post
+_PLATFORM_VALUES: Dict[str, str] = {platform.value: platform.value for platform in PlatformEnum}
+
+# Parsed posts of recent actor runs, keyed by (platform, username, max_posts).
+# Shared by all collector instances so repeat runs within the TTL skip Apify.
+PROFILE_POSTS_TTL_SECONDS = 300
+_profile_posts_cache: TTLCache = TTLCache(maxsize=256, ttl=PROFILE_POSTS_TTL_SECONDS)
+
+# Process-wide cap on concurrent actor runs so parallel collections don't trip rate limits
+_actor_semaphore = asyncio.Semaphore(int(os.getenv("APIFY_MAX_CONCURRENCY", "3")))
+
 class ApifyCollector:
     """Apify data collector for web scraping"""
 
+    # Fields that are identical for every parsed post; copied per item
+    _INSTAGRAM_POST_TEMPLATE = {
+        "platform": PlatformEnum.INSTAGRAM,
+        "mentions": (),  # Apify might not extract mentions directly
+        "is_processed": False,
+        "processing_errors": ()
+    }
+    _TWITTER_POST_TEMPLATE = {
+        "platform": PlatformEnum.TWITTER,
+        "is_processed": False,
+        "processing_errors": ()
+    }
+
+    # Posts are saved in batches of this size while the dataset is still being read
+    SAVE_BATCH_SIZE = 100
+    _QUEUE_MAXSIZE = 500
+
     def __init__(self, api_token: str):
         self.client = ApifyClient(api_token)
         self.instagram_actor_id = "apidojo/instagram-scraper"  # Popular Instagram scraper actor
         self.twitter_actor_id = "apidojo/tweet-scraper"  # Twitter scraper
         self.youtube_actor_id = "streamers/youtube-scraper"  # YouTube scraper
 
-    async def run_actor(self, actor_id: str, input_data: Dict) -> Optional[Dict]:
-        """Run an Apify actor and get results"""
-        try:
+    async def _run_actor_to_completion(self, actor_id: str, input_data: Dict) -> Optional[Dict]:
+        """Start an Apify actor and wait until the run finishes"""
+        async with _actor_semaphore:
+            # The Apify client is synchronous; run its HTTP calls off the event loop
             # Start the actor
-            run = self.client.actor(actor_id).start(input=input_data)
+            run = await asyncio.to_thread(self.client.actor(actor_id).start, input=input_data)
 
             # Wait for completion
             while True:
-                run_info = self.client.run(run["id"]).get()
+                run_info = await asyncio.to_thread(self.client.run(run["id"]).get)
                 if run_info["status"] in ["SUCCEEDED", "FAILED", "ABORTED"]:
                     break
                 await asyncio.sleep(5)  # Wait 5 seconds before checking again
 
-            if run_info["status"] != "SUCCEEDED":
-                logger.error(f"Actor run failed: {run_info['status']}")
+        if run_info["status"] != "SUCCEEDED":
+            logger.error(f"Actor run failed: {run_info['status']}")
+            return None
+
+        return run_info
+
+    async def run_actor(self, actor_id: str, input_data: Dict) -> Optional[Dict]:
+        """Run an Apify actor and get results"""
+        try:
+            run_info = await self._run_actor_to_completion(actor_id, input_data)
+            if not run_info:
                 return None
 
             # Get dataset items
-            dataset_items = self.client.dataset(run["defaultDatasetId"]).list_items().items
+            dataset_page = await asyncio.to_thread(self.client.dataset(run_info["defaultDatasetId"]).list_items)
+            dataset_items = dataset_page.items
             return {"run_info": run_info, "data": dataset_items}
 
         except Exception as e:
             logger.error(f"Error running Apify actor {actor_id}: {e}")
             return None
 
+    def _iter_dataset_sync(self, dataset_id: str, limit: int, queue: asyncio.Queue,
+                           loop: asyncio.AbstractEventLoop) -> None:
+        """Read dataset items in a worker thread and hand them to the event loop"""
+        try:
+            for item in self.client.dataset(dataset_id).iterate_items(limit=limit):
+                asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+        finally:
+            # None marks the end of the dataset for the consumer
+            asyncio.run_coroutine_threadsafe(queue.put(None), loop).result()
+
+    async def _stream_and_save(self, dataset_id: str, parser: Callable[[List[Dict]], List[Dict]],
+                               max_posts: int) -> int:
+        """Save dataset items in batches while they are still being downloaded"""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._QUEUE_MAXSIZE)
+        producer = loop.run_in_executor(None, self._iter_dataset_sync, dataset_id, max_posts, queue, loop)
+
+        saved_count = 0
+        batch = []
+        finished = False
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    finished = True
+                    break
+
+                batch.append(item)
+                if len(batch) >= self.SAVE_BATCH_SIZE:
+                    saved_count += await self.save_posts_to_db(parser(batch))
+                    batch = []
+
+            if batch:
+                saved_count += await self.save_posts_to_db(parser(batch))
+        finally:
+            # Keep draining so the producer thread is never left blocked on a full queue
+            while not finished:
+                finished = await queue.get() is None
+            try:
+                await producer
+            except Exception as e:
+                # Batches saved before the failure stay saved, so still report them
+                logger.error(f"Error reading Apify dataset {dataset_id} after saving {saved_count} posts: {e}")
+
+        return saved_count
+
+    @classmethod
+    def _build_instagram_post(cls, item: Dict, collected_at: datetime) -> Dict:
+        """Convert a single Instagram scraper item into a post dict"""
+        item_type = item.get("type")
+        username = item.get("ownerUsername")
+        display_url = item.get("displayUrl")
+        media_urls = [display_url] if display_url else []
+        if item_type == "Sidecar":
+            # Carousel children arrive already materialized in the payload; no per-child fetch
+            media_urls = list(item.get("images") or ()) or media_urls
+
+        post_data = cls._INSTAGRAM_POST_TEMPLATE.copy()
+        post_data.update(
+            post_id=item.get("id") or item.get("shortCode"),
+            author=username,
+            author_username=username,
+            author_name=item.get("ownerFullName") or username,
+            content=item.get("caption", ""),
+            url=item.get("url") or f"https://www.instagram.com/p/{item.get('shortCode')}/",
+            posted_at=parse_timestamp(item.get("timestamp")),
+            collected_at=collected_at,
+            engagement_metrics={
+                "likes": item.get("likesCount", 0),
+                "comments": item.get("commentsCount", 0),
+                "shares": item.get("videoPlayCount", 0) if item_type == "Video" else 0
+            },
+            likes_count=item.get("likesCount", 0),
+            comments_count=item.get("commentsCount", 0),
+            views_count=item.get("videoViewCount") or item.get("videoPlayCount"),
+            hashtags=tuple(item.get("hashtags") or ()),
+            media_urls=media_urls
+        )
+        return post_data
+
+    @classmethod
+    def _build_twitter_post(cls, item: Dict, collected_at: datetime) -> Dict:
+        """Convert a single Twitter scraper item into a post dict"""
+        author = item.get("author") or {}
+        username = author.get("userName")
+
+        post_data = cls._TWITTER_POST_TEMPLATE.copy()
+        post_data.update(
+            post_id=item.get("id"),
+            author=username,
+            author_username=username,
+            author_name=author.get("fullName") or username,
+            content=item.get("text", ""),
+            url=item.get("url"),
+            posted_at=parse_timestamp(item.get("createdAt")),
+            collected_at=collected_at,
+            engagement_metrics={
+                "likes": item.get("likeCount", 0),
+                "retweets": item.get("retweetCount", 0),
+                "replies": item.get("replyCount", 0)
+            },
+            likes_count=item.get("likeCount", 0),
+            shares_count=item.get("retweetCount", 0),
+            comments_count=item.get("replyCount", 0),
+            hashtags=tuple(item.get("hashtags") or ()),
+            mentions=tuple(item.get("mentions") or ()),
+            media_urls=[media.get("url") for media in item.get("media", []) if media.get("url")]
+        )
+        return post_data
+
     def parse_instagram_data(self, raw_data: List[Dict]) -> List[Dict]:
         """Parse Instagram scraper results into standard format"""
         posts_data = []
+        collected_at = datetime.utcnow()
 
         for item in raw_data:
             try:
-                post_data = {
-                    "platform": PlatformEnum.INSTAGRAM,
-                    "post_id": item.get("id") or item.get("shortCode"),
-                    "author": item.get("ownerUsername"),
-                    "author_username": item.get("ownerUsername"),
-                    "author_name": item.get("ownerFullName") or item.get("ownerUsername"),
-                    "content": item.get("caption", ""),
-                    "url": item.get("url") or f"https://www.instagram.com/p/{item.get('shortCode')}/",
-                    "posted_at": datetime.fromisoformat(item["timestamp"].replace('Z', '+00:00')) if item.get("timestamp") else None,
-                    "collected_at": datetime.utcnow(),
-                    "engagement_metrics": {
-                        "likes": item.get("likesCount", 0),
-                        "comments": item.get("commentsCount", 0),
-                        "shares": item.get("videoPlayCount", 0) if item.get("type") == "Video" else 0
-                    },
-                    "likes_count": item.get("likesCount", 0),
-                    "comments_count": item.get("commentsCount", 0),
-                    "views_count": item.get("videoViewCount") or item.get("videoPlayCount"),
-                    "hashtags": item.get("hashtags", []),
-                    "mentions": [],  # Apify might not extract mentions directly
-                    "media_urls": [item.get("displayUrl")] if item.get("displayUrl") else [],
-                    "is_processed": False,
-                    "processing_errors": []
-                }
-
-                posts_data.append(post_data)
-
+                posts_data.append(self._build_instagram_post(item, collected_at))
             except Exception as e:
                 logger.error(f"Error parsing Instagram item: {e}")
 
@@ -90,104 +221,152 @@ class ApifyCollector:
     def parse_twitter_data(self, raw_data: List[Dict]) -> List[Dict]:
         """Parse Twitter scraper results"""
         posts_data = []
+        collected_at = datetime.utcnow()
 
         for item in raw_data:
             try:
-                post_data = {
-                    "platform": PlatformEnum.TWITTER,
-                    "post_id": item.get("id"),
-                    "author": item.get("author", {}).get("userName"),
-                    "author_username": item.get("author", {}).get("userName"),
-                    "author_name": item.get("author", {}).get("fullName") or item.get("author", {}).get("userName"),
-                    "content": item.get("text", ""),
-                    "url": item.get("url"),
-                    "posted_at": datetime.fromisoformat(item["createdAt"].replace('Z', '+00:00')) if item.get("createdAt") else None,
-                    "collected_at": datetime.utcnow(),
-                    "engagement_metrics": {
-                        "likes": item.get("likeCount", 0),
-                        "retweets": item.get("retweetCount", 0),
-                        "replies": item.get("replyCount", 0)
-                    },
-                    "likes_count": item.get("likeCount", 0),
-                    "shares_count": item.get("retweetCount", 0),
-                    "comments_count": item.get("replyCount", 0),
-                    "hashtags": item.get("hashtags", []),
-                    "mentions": item.get("mentions", []),
-                    "media_urls": [media.get("url") for media in item.get("media", []) if media.get("url")],
-                    "is_processed": False,
-                    "processing_errors": []
-                }
-
-                posts_data.append(post_data)
-
+                posts_data.append(self._build_twitter_post(item, collected_at))
             except Exception as e:
                 logger.error(f"Error parsing Twitter item: {e}")
 
         return posts_data
 
-    async def collect_instagram_profile(self, username: str, max_posts: int = 10) -> List[Dict]:
-        """Collect Instagram posts from a profile"""
-        input_data = {
+    @staticmethod
+    def _instagram_input(username: str, max_posts: int) -> Dict:
+        return {
             "username": [username],
             "resultsLimit": max_posts
         }
 
-        result = await self.run_actor(self.instagram_actor_id, input_data)
+    @staticmethod
+    def _twitter_input(username: str, max_posts: int) -> Dict:
+        return {
+            "searchTerms": [f"from:{username}"],
+            "maxItems": max_posts
+        }
+
+    async def collect_instagram_profile(self, username: str, max_posts: int = 10) -> List[Dict]:
+        """Collect Instagram posts from a profile"""
+        cache_key = ("instagram", username.lower(), max_posts)
+        cached = _profile_posts_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
+        result = await self.run_actor(self.instagram_actor_id, self._instagram_input(username, max_posts))
         if not result:
             return []
 
-        return self.parse_instagram_data(result["data"])
+        posts_data = self.parse_instagram_data(result["data"])
+        _profile_posts_cache[cache_key] = tuple(posts_data)
+        return posts_data
 
     async def collect_twitter_user(self, username: str, max_posts: int = 10) -> List[Dict]:
         """Collect Twitter posts from a user"""
-        input_data = {
-            "searchTerms": [f"from:{username}"],
-            "maxItems": max_posts
-        }
+        cache_key = ("twitter", username.lower(), max_posts)
+        cached = _profile_posts_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
 
-        result = await self.run_actor(self.twitter_actor_id, input_data)
+        result = await self.run_actor(self.twitter_actor_id, self._twitter_input(username, max_posts))
         if not result:
             return []
 
-        return self.parse_twitter_data(result["data"])
+        posts_data = self.parse_twitter_data(result["data"])
+        _profile_posts_cache[cache_key] = tuple(posts_data)
+        return posts_data
+
+    async def _stored_post_ids(self, platform: str, post_ids: List[str]) -> Set[str]:
+        """Which of post_ids are already stored for a platform (one query per batch)"""
+        try:
+            cursor = SocialMediaPost.get_motor_collection().find(
+                {"platform": platform, "post_id": {"$in": post_ids}},
+                {"post_id": 1, "_id": 0}
+            )
+            return {doc["post_id"] async for doc in cursor}
+        except Exception as e:
+            # The unique index still rejects duplicates, so just insert everything
+            logger.warning(f"Could not check stored {platform} post ids: {e}")
+            return set()
 
     async def save_posts_to_db(self, posts_data: List[Dict]) -> int:
-        """Save collected posts to MongoDB"""
-        saved_count = 0
+        """Save collected posts to MongoDB.
+
+        Posts of this batch that are already stored are skipped after one
+        $in query per platform; the unique (platform, post_id) index with an
+        unordered insert remains the real dedup for concurrent writers.
+        """
+        ids_by_platform: Dict[str, List[str]] = {}
+        for post_data in posts_data:
+            platform = _PLATFORM_VALUES.get(post_data.get("platform"))
+            if platform and post_data.get("post_id"):
+                ids_by_platform.setdefault(platform, []).append(post_data["post_id"])
 
+        stored_by_platform: Dict[str, Set[str]] = {}
+        for platform, post_ids in ids_by_platform.items():
+            stored_by_platform[platform] = await self._stored_post_ids(platform, post_ids)
+
+        new_posts = []
+        skipped = 0
         for post_data in posts_data:
             try:
-                # Check if post already exists
-                existing = await SocialMediaPost.find_one(
-                    SocialMediaPost.platform == post_data["platform"],
-                    SocialMediaPost.post_id == post_data["post_id"]
-                )
-
-                if existing:
-                    logger.info(f"Post {post_data['post_id']} already exists, skipping")
+                platform = _PLATFORM_VALUES[post_data["platform"]]
+                if post_data["post_id"] in stored_by_platform.get(platform, ()):
+                    skipped += 1
                     continue
 
-                post = SocialMediaPost(**post_data)
-                await post.insert()
-                saved_count += 1
-                logger.info(f"Saved post {post_data['post_id']}")
-
+                new_posts.append(SocialMediaPost(**post_data))
             except Exception as e:
                 logger.error(f"Error saving post {post_data.get('post_id', 'unknown')}: {e}")
 
+        if skipped:
+            logger.info(f"Skipped {skipped} posts that already exist")
+
+        if not new_posts:
+            return 0
+
+        failed = 0
+        duplicates = 0
+        try:
+            await SocialMediaPost.insert_many(new_posts, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                if error.get("code") == DUPLICATE_KEY_ERROR:
+                    duplicates += 1
+                else:
+                    logger.error(f"Error saving post: {error.get('errmsg')}")
+                    failed += 1
+        except Exception as e:
+            logger.error(f"Error saving posts batch: {e}")
+            return 0
+
+        saved_count = len(new_posts) - failed - duplicates
+        logger.info(f"Saved {saved_count} posts")
         return saved_count
 
     async def collect_and_save(self, platform: str, target: str, max_posts: int = 10) -> int:
         """Collect data from specified platform and save to database"""
         if platform == "instagram":
-            posts_data = await self.collect_instagram_profile(target, max_posts)
+            actor_id = self.instagram_actor_id
+            input_data = self._instagram_input(target, max_posts)
+            parser = self.parse_instagram_data
         elif platform == "twitter":
-            posts_data = await self.collect_twitter_user(target, max_posts)
+            actor_id = self.twitter_actor_id
+            input_data = self._twitter_input(target, max_posts)
+            parser = self.parse_twitter_data
         else:
             logger.error(f"Unsupported platform: {platform}")
             return 0
 
-        saved_count = await self.save_posts_to_db(posts_data)
+        try:
+            run_info = await self._run_actor_to_completion(actor_id, input_data)
+            if not run_info:
+                return 0
+
+            saved_count = await self._stream_and_save(run_info["defaultDatasetId"], parser, max_posts)
+        except Exception as e:
+            logger.error(f"Error running Apify actor {actor_id}: {e}")
+            return 0
+
         logger.info(f"Collected and saved {saved_count} posts from {platform} {target}")
 
-        return saved_count
\ No newline at end of file
+        return saved_count
@@ -5,6 +5,7 @@ Official Facebook API - 100% reliable, no browser automation issues
 
 import requests
 import json
+import orjson
 from typing import Dict, List, Optional
 from datetime import datetime
 import logging
@@ -31,7 +32,7 @@ class FacebookGraphAPICollector:
         }
         response = self.session.get(url, params=params)
         response.raise_for_status()
-        return response.json()["access_token"]
+        return orjson.loads(response.content)["access_token"]
 
     def get_user_access_token(self, short_lived_token: str) -> str:
         """Exchange short-lived token for long-lived token"""
@@ -44,7 +45,7 @@ class FacebookGraphAPICollector:
         }
         response = self.session.get(url, params=params)
         response.raise_for_status()
-        return response.json()["access_token"]
+        return orjson.loads(response.content)["access_token"]
 
     def get_user_profile(self, user_id: str = "me") -> Dict:
         """Get user profile information"""
@@ -55,7 +56,7 @@ class FacebookGraphAPICollector:
         }
         response = self.session.get(url, params=params)
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
 
     def get_user_posts(self, user_id: str = "me", limit: int = 100) -> List[Dict]:
         """Get user's posts"""
@@ -67,7 +68,7 @@ class FacebookGraphAPICollector:
         }
         response = self.session.get(url, params=params)
         response.raise_for_status()
-        return response.json().get("data", [])
+        return orjson.loads(response.content).get("data", [])
 
     def get_user_friends(self, user_id: str = "me") -> List[Dict]:
         """Get user's friends (requires friends permission)"""
@@ -77,7 +78,7 @@ class FacebookGraphAPICollector:
         }
         response = self.session.get(url, params=params)
         response.raise_for_status()
-        return response.json().get("data", [])
+        return orjson.loads(response.content).get("data", [])
 
     def get_user_photos(self, user_id: str = "me", limit: int = 100) -> List[Dict]:
         """Get user's photos"""
@@ -89,7 +90,7 @@ class FacebookGraphAPICollector:
         }
         response = self.session.get(url, params=params)
         response.raise_for_status()
-        return response.json().get("data", [])
+        return orjson.loads(response.content).get("data", [])
 
     def get_page_info(self, page_id: str) -> Dict:
         """Get Facebook page information"""
@@ -100,7 +101,7 @@ class FacebookGraphAPICollector:
         }
         response = self.session.get(url, params=params)
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
 
     def get_page_posts(self, page_id: str, limit: int = 100) -> List[Dict]:
         """Get page posts"""
@@ -112,7 +113,7 @@ class FacebookGraphAPICollector:
         }
         response = self.session.get(url, params=params)
         response.raise_for_status()
-        return response.json().get("data", [])
+        return orjson.loads(response.content).get("data", [])
 
     def search_pages(self, query: str, limit: int = 25) -> List[Dict]:
         """Search for Facebook pages"""
@@ -126,7 +127,7 @@ class FacebookGraphAPICollector:
         }
         response = self.session.get(url, params=params)
         response.raise_for_status()
-        return response.json().get("data", [])
+        return orjson.loads(response.content).get("data", [])
 
     def collect_comprehensive_user_data(self, user_id: str = "me") -> Dict:
         """Collect comprehensive user data"""
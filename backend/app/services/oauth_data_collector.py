@@ -5,10 +5,19 @@ Uses stored OAuth tokens to collect user data from connected accounts
 
 import asyncio
 import aiohttp
-import json
-from typing import List, Dict, Any, Optional
+import functools
+import hashlib
+import orjson
+import random
+import time
+from cachetools import LRUCache
+from typing import Callable, List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
+from urllib.parse import urlparse
 import logging
+from beanie.operators import In
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
 from app.models.mongo_models import SocialMediaPost, PlatformEnum, ThreatLevelEnum
 from app.models.social_auth_models import (
@@ -16,70 +25,441 @@ from app.models.social_auth_models import (
     CollectedInteraction, SearchHistory, PostComment, PostLike,
     PlatformType, ConnectionType
 )
-from app.core.config import get_settings
+from app.core.oauth_config import oauth_settings
+from app.core.timeutils import parse_timestamp
 from app.services.facebook_graph_api_collector import FacebookGraphAPICollector
 
 logger = logging.getLogger(__name__)
 
+# Fixed endpoints and request parameters; collectors only add the per-account token
+_INSTAGRAM_MEDIA_URL = "https://graph.instagram.com/me/media"
+_INSTAGRAM_MEDIA_PARAMS = {
+    "fields": "id,media_type,media_url,permalink,caption,timestamp,like_count,comments_count",
+    "limit": 50
+}
+_REDDIT_HEADERS = {"User-Agent": "OSINT-Platform/1.0"}
+_REDDIT_SUBMITTED_PARAMS = {"limit": 50, "sort": "new"}
+_YOUTUBE_SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
+_YOUTUBE_VIDEOS_URL = "https://www.googleapis.com/youtube/v3/videos"
+_YOUTUBE_SEARCH_PARAMS = {
+    "part": "snippet",
+    "forMine": "true",
+    "type": "video",
+    "maxResults": 50
+}
+
+
+def _empty_sections() -> Dict[str, List[Any]]:
+    return {"posts": [], "connections": [], "interactions": [], "search_histories": []}
+
+
+def _safeplatform(name: str, fallback: Callable[[], Any] = list):
+    """Log and swallow a platform collector's errors, returning fallback() instead.
+
+    Uses lazy %-formatting so nothing is built unless a collector actually fails.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(self, account: SocialAccount):
+            try:
+                return await fn(self, account)
+            except Exception as e:
+                logger.error("Error collecting %s data: %s", name, e)
+                return fallback()
+        return wrapper
+    return decorator
+
+
+def _dig(data: Any, *keys: str, default: Any = 0) -> Any:
+    """Walk nested dicts along keys, returning default at the first missing level"""
+    for key in keys:
+        if not isinstance(data, dict):
+            return default
+        data = data.get(key)
+        if data is None:
+            return default
+    return data
+
+
+def _fb_post_dict(post: Dict[str, Any], account_id: str) -> Dict[str, Any]:
+    """Facebook Graph API post -> collected post dict"""
+    return {
+        "platform": "facebook",
+        "post_id": post.get("id"),
+        "content": post.get("message", ""),
+        "created_at": post.get("created_time"),
+        "url": post.get("permalink_url"),
+        "likes_count": _dig(post, "reactions", "summary", "total_count"),
+        "comments_count": _dig(post, "comments", "summary", "total_count"),
+        "shares_count": _dig(post, "shares", "count"),
+        "attachments": _dig(post, "attachments", "data", default=[]),
+        "account_id": account_id
+    }
+
+
+def _fb_photo_dict(photo: Dict[str, Any], account_id: str) -> Dict[str, Any]:
+    """Facebook Graph API photo -> collected post dict"""
+    return {
+        "platform": "facebook",
+        "post_id": photo.get("id"),
+        "content": photo.get("name", ""),
+        "created_at": photo.get("created_time"),
+        "url": photo.get("source"),
+        "media_type": "photo",
+        "album": _dig(photo, "album", "name", default=None),
+        "account_id": account_id
+    }
+
+
+def _fb_friend_dict(friend: Dict[str, Any], account_id: str) -> Dict[str, Any]:
+    """Facebook Graph API friend -> collected connection dict"""
+    return {
+        "platform": "facebook",
+        "connection_type": "friend",
+        "target_user_id": friend.get("id"),
+        "target_username": friend.get("name"),
+        "target_profile_url": f"https://facebook.com/{friend.get('id')}",
+        "relationship": "friend",
+        "account_id": account_id
+    }
+
+
+def _fetch_and_transform_fb(collector: FacebookGraphAPICollector, account_id: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Collect comprehensive Facebook user data and normalize it (runs in a worker thread)"""
+    user_data = collector.collect_comprehensive_user_data()
+
+    # Posts and photos both land in the posts list
+    posts = [_fb_post_dict(post, account_id) for post in user_data.get("posts", [])]
+    posts += [_fb_photo_dict(photo, account_id) for photo in user_data.get("photos", [])]
+    return {
+        "posts": posts,
+        "connections": [_fb_friend_dict(friend, account_id) for friend in user_data.get("friends", [])]
+    }
+
+
+def _reddit_post_dict(post_data: Dict[str, Any], account: SocialAccount) -> Dict[str, Any]:
+    """Reddit listing child data -> collected post dict"""
+    score = post_data.get("score", 0)
+    num_comments = post_data.get("num_comments", 0)
+    return {
+        "platform": PlatformEnum.REDDIT,
+        "post_id": post_data["id"],
+        "author": account.username,
+        "author_username": account.username,
+        "content": post_data.get("selftext", "") or post_data.get("title", ""),
+        "url": f"https://reddit.com{post_data['permalink']}",
+        "posted_at": parse_timestamp(post_data["created_utc"]),
+        "engagement_metrics": {
+            "score": score,
+            "comments": num_comments
+        },
+        "likes_count": score,
+        "comments_count": num_comments,
+        "collected_by": account.user_id,
+        "threat_level": ThreatLevelEnum.LOW
+    }
+
+
+def _seconds_until_reset(headers) -> Optional[float]:
+    """Seconds until the rate-limit window resets, from Reddit-style (seconds)
+    or Twitter-style (epoch timestamp) reset headers"""
+    reset = headers.get("X-Ratelimit-Reset") or headers.get("X-Rate-Limit-Reset")
+    if reset is None:
+        return None
+    try:
+        reset = float(reset)
+    except ValueError:
+        return None
+    # Values this large are epoch timestamps rather than relative seconds
+    if reset > 1_000_000_000:
+        reset -= time.time()
+    return max(reset, 0.0)
+
+
 class OAuthDataCollector:
-    """Collect data using OAuth tokens from connected social accounts"""
+    """Collect data using OAuth tokens from connected social accounts.
+
+    Accounts and their API calls are collected concurrently on the event loop,
+    so the server is expected to run on uvloop (uvicorn's default loop="auto"
+    picks it up from requirements.txt).
+    """
+
+    # Concurrent requests allowed against a single API host
+    MAX_REQUESTS_PER_HOST = 4
+
+    # Per-request limits so one hung endpoint cannot stall a whole sync
+    REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5)
+
+    # Retries for rate-limited (429) and 5xx responses
+    MAX_RETRIES = 5
+    MAX_RETRY_DELAY = 60.0
+
+    # Response bodies larger than this are decoded in a worker thread
+    THREADED_DECODE_THRESHOLD = 256 * 1024
+
+    # Access tokens expiring within this window are refreshed before collecting
+    TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+    INSTAGRAM_POST_MEDIA_TYPES = frozenset({"IMAGE", "CAROUSEL_ALBUM", "VIDEO"})
+
+    # Documents per insert_many round-trip when saving collected data
+    SAVE_BATCH_SIZE = 500
+
+    # Collections larger than this are validated in a worker thread
+    THREADED_VALIDATION_THRESHOLD = 100
+
+    # Natural keys that make re-synced posts and connections upserts, matching
+    # the unique indexes created in app.core.mongodb.ensure_unique_indexes
+    POST_KEY_FIELDS = ("social_account_id", "platform", "platform_post_id")
+    CONNECTION_KEY_FIELDS = ("social_account_id", "platform", "platform_user_id")
+
+    # Fields an upsert never overwrites once the document exists
+    WRITE_ONCE_FIELDS = frozenset({"collected_at"})
+
+    # Accounts collected concurrently in a single sync
+    MAX_CONCURRENT_ACCOUNTS = 8
 
     def __init__(self):
         self.session: Optional[aiohttp.ClientSession] = None
+        # Set at startup; the OAuthService lives on app.state
+        self.oauth_service = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        # host -> monotonic time its exhausted rate-limit window reopens
+        self._rate_limited_until: Dict[str, float] = {}
+        self._account_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_ACCOUNTS)
+        # hash(url, params, auth) -> (etag, last_modified, decoded body)
+        self._conditional_cache: LRUCache = LRUCache(maxsize=1024)
+        # Platform value -> collector; every implemented platform must be listed here
+        self._platform_collectors = {
+            "facebook": self._collect_facebook_data,
+            "instagram": self._collect_instagram_data,
+            "reddit": self._collect_reddit_data,
+            "youtube": self._collect_youtube_data,
+        }
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use.
+
+        Reusing one session keeps connections, TLS sessions and DNS entries
+        warm across collection runs instead of rebuilding them every call.
+        """
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100, limit_per_host=8, ttl_dns_cache=600, keepalive_timeout=75,
+                    # aiodns resolves on the event loop instead of a getaddrinfo thread
+                    resolver=aiohttp.AsyncResolver()
+                ),
+                timeout=self.REQUEST_TIMEOUT
+            )
+        return self.session
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """Semaphore bounding in-flight requests to the host of ``url``"""
+        host = urlparse(url).hostname
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(self.MAX_REQUESTS_PER_HOST)
+        return semaphore
+
+    async def _get_json(self, url: str, params: Optional[Dict[str, Any]] = None,
+                        headers: Optional[Dict[str, str]] = None) -> Optional[Any]:
+        """GET a JSON resource, revalidating a cached copy with ETag / Last-Modified.
+
+        Rate-limited (429) and server error responses are retried up to
+        MAX_RETRIES times. Returns the decoded body (the cached one on 304 Not
+        Modified), or None for any other non-200 response.
+        """
+        request_headers = dict(headers or {})
+        # Tokens are part of the key so cached bodies never cross accounts; the
+        # key is hashed so the cache doesn't hold raw tokens
+        cache_key = hashlib.blake2b(
+            repr((url, sorted((params or {}).items()), request_headers.get("Authorization"))).encode(),
+            digest_size=16
+        ).digest()
+        cached = self._conditional_cache.get(cache_key)
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                request_headers["If-None-Match"] = etag
+            if last_modified:
+                request_headers["If-Modified-Since"] = last_modified
+
+        host = urlparse(url).hostname
+        for attempt in range(self.MAX_RETRIES + 1):
+            await self._wait_for_rate_limit(host)
+            async with self._host_semaphore(url), self.session.get(url, headers=request_headers, params=params) as response:
+                self._note_rate_limit(host, response)
+                if response.status == 304 and cached:
+                    return cached[2]
+                if response.status == 200:
+                    body = await response.read()
+                    if len(body) > self.THREADED_DECODE_THRESHOLD:
+                        data = await asyncio.to_thread(orjson.loads, body)
+                    else:
+                        data = orjson.loads(body)
+                    etag = response.headers.get("ETag")
+                    last_modified = response.headers.get("Last-Modified")
+                    if etag or last_modified:
+                        self._conditional_cache[cache_key] = (etag, last_modified, data)
+                    return data
+
+                retryable = response.status == 429 or response.status >= 500
+                if not retryable or attempt == self.MAX_RETRIES:
+                    error_text = await response.text()
+                    logger.warning("GET %s returned %s: %s", url, response.status, error_text)
+                    return None
+
+                delay = self._retry_delay(response, attempt)
+
+            # Sleep outside the host semaphore so other requests can proceed
+            logger.info("GET %s returned %s, retrying in %.1fs", url, response.status, delay)
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _retry_delay(response: aiohttp.ClientResponse, attempt: int) -> float:
+        """Seconds to wait before retrying: Retry-After or the rate-limit reset if given,
+        else exponential backoff with jitter"""
+        backoff = 2 ** attempt + random.random()
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(float(retry_after), OAuthDataCollector.MAX_RETRY_DELAY)
+            except ValueError:
+                pass
+        if response.status == 429:
+            reset_in = _seconds_until_reset(response.headers)
+            if reset_in is not None:
+                return min(max(reset_in, backoff), OAuthDataCollector.MAX_RETRY_DELAY)
+        return backoff
+
+    def _note_rate_limit(self, host: str, response: aiohttp.ClientResponse):
+        """Record when a host's rate-limit window reopens once its quota is used up"""
+        remaining = response.headers.get("X-Ratelimit-Remaining") or response.headers.get("X-Rate-Limit-Remaining")
+        if remaining is None:
+            return
+        try:
+            exhausted = float(remaining) < 1
+        except ValueError:
+            return
+        if exhausted:
+            reset_in = _seconds_until_reset(response.headers)
+            if reset_in is not None:
+                self._rate_limited_until[host] = time.monotonic() + min(reset_in, self.MAX_RETRY_DELAY)
+
+    async def _wait_for_rate_limit(self, host: str):
+        """Hold new requests to a host until its exhausted rate-limit window resets"""
+        until = self._rate_limited_until.get(host)
+        if until is None:
+            return
+        delay = until - time.monotonic()
+        if delay > 0:
+            logger.info("Rate limit exhausted for %s, waiting %.1fs", host, delay)
+            await asyncio.sleep(delay)
+        self._rate_limited_until.pop(host, None)
+
+    async def startup(self, oauth_service=None):
+        """Open the shared HTTP session (called on application startup).
+
+        oauth_service is the application's OAuthService, used to refresh
+        expiring access tokens before collecting.
+        """
+        self.oauth_service = oauth_service
+        await self._get_session()
+
+    async def aclose(self):
+        """Close the shared HTTP session (called on application shutdown)"""
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
 
     async def collect_data_for_user(self, user_id: str) -> Dict[str, Any]:
         """Collect data from all connected social accounts for a user"""
 
-        collected_data = {
-            "posts": [],
-            "connections": [],
-            "interactions": [],
-            "search_histories": []
-        }
-
-        warnings = []
-        platform_results = {}
-
         # Get all connected accounts for the user
         accounts = await SocialAccount.find(
             SocialAccount.user_id == user_id,
             SocialAccount.is_active == True
         ).to_list()
 
-        async with aiohttp.ClientSession() as session:
-            self.session = session
+        await self._get_session()
 
-            for account in accounts:
-                try:
-                    account_data = await self._collect_from_platform(account)
-                    
-                    # Track results per platform
-                    platform = account.platform.value
-                    if platform not in platform_results:
-                        platform_results[platform] = {"posts": 0, "connections": 0, "interactions": 0, "search_histories": 0}
-                    
-                    # Extend collected data
-                    collected_data["posts"].extend(account_data.get("posts", []))
-                    collected_data["connections"].extend(account_data.get("connections", []))
-                    collected_data["interactions"].extend(account_data.get("interactions", []))
-                    collected_data["search_histories"].extend(account_data.get("search_histories", []))
-                    
-                    # Update counts
-                    platform_results[platform]["posts"] += len(account_data.get("posts", []))
-                    platform_results[platform]["connections"] += len(account_data.get("connections", []))
-                    platform_results[platform]["interactions"] += len(account_data.get("interactions", []))
-                    platform_results[platform]["search_histories"] += len(account_data.get("search_histories", []))
-
-                    # Update last sync time
-                    account.last_sync = datetime.utcnow()
-                    await account.save()
+        return await self._collect_accounts(user_id, accounts)
 
-                except Exception as e:
-                    logger.error(f"Error collecting from {account.platform}: {e}")
-                    continue
+    async def collect_data_for_users(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Collect data for many users at once (e.g. a scheduled run).
+
+        All active accounts are loaded in one query and every user is collected
+        concurrently on the shared session; the account and per-host semaphores
+        bound the actual request concurrency. Returns results keyed by user id.
+        """
+        accounts = await SocialAccount.find(
+            In(SocialAccount.user_id, user_ids),
+            SocialAccount.is_active == True
+        ).to_list()
+
+        accounts_by_user: Dict[str, List[SocialAccount]] = {user_id: [] for user_id in user_ids}
+        for account in accounts:
+            accounts_by_user[account.user_id].append(account)
 
-        # Save collected data to database
-        saved_counts = await self._save_collected_data(user_id, collected_data)
+        await self._get_session()
+
+        results = await asyncio.gather(
+            *(self._collect_accounts(user_id, user_accounts) for user_id, user_accounts in accounts_by_user.items())
+        )
+        return dict(zip(accounts_by_user, results))
+
+    async def _collect_accounts(self, user_id: str, accounts: List[SocialAccount]) -> Dict[str, Any]:
+        """Collect and save data for a user's accounts and summarize the results"""
+
+        warnings = []
+        platform_results = {}
+        saved_counts = {
+            "posts_saved": 0,
+            "connections_saved": 0,
+            "interactions_saved": 0,
+            "search_histories_saved": 0
+        }
+
+        # Accounts are independent, so collect them concurrently; each account's
+        # data is saved as soon as it arrives, overlapping with other fetches
+        results = await asyncio.gather(
+            *(self._collect_and_save(user_id, account) for account in accounts),
+            return_exceptions=True
+        )
+
+        synced_accounts = []
+        for account, result in zip(accounts, results):
+            if isinstance(result, Exception):
+                logger.error("Error collecting from %s: %s", account.platform, result)
+                continue
+
+            collected_counts, account_saved_counts = result
+
+            # Track results per platform
+            platform = account.platform.value
+            if platform not in platform_results:
+                platform_results[platform] = {"posts": 0, "connections": 0, "interactions": 0, "search_histories": 0}
+            for key, count in collected_counts.items():
+                platform_results[platform][key] += count
+
+            for key, count in account_saved_counts.items():
+                saved_counts[key] += count
+
+            synced_accounts.append(account)
+
+        # Update last sync time for every successful account in one round-trip
+        if synced_accounts:
+            now = datetime.utcnow()
+            try:
+                await SocialAccount.get_motor_collection().update_many(
+                    {"_id": {"$in": [account.id for account in synced_accounts]}},
+                    {"$set": {"last_sync": now}}
+                )
+                for account in synced_accounts:
+                    account.last_sync = now
+            except Exception as e:
+                logger.error("Error updating last sync time: %s", e)
 
         # Add platform-specific warnings
         for platform, counts in platform_results.items():
@@ -101,366 +481,367 @@ class OAuthDataCollector:
 
         return result
 
+    async def _collect_and_save(self, user_id: str, account: SocialAccount) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """Collect one account and save its data right away.
+
+        Returns the collected and saved counts; the collected documents are
+        released once saved instead of being held until every account is done.
+        """
+        account_data = await self._collect_from_platform(account)
+        collected_counts = {key: len(items) for key, items in account_data.items()}
+        saved_counts = await self._save_collected_data(user_id, account_data)
+        return collected_counts, saved_counts
+
     async def _save_collected_data(self, user_id: str, collected_data: Dict[str, List]) -> Dict[str, int]:
         """Save all collected data to database"""
-        saved_counts = {
-            "posts_saved": 0,
-            "connections_saved": 0,
-            "interactions_saved": 0,
-            "search_histories_saved": 0
+        posts_saved, connections_saved, interactions_saved, search_histories_saved = await asyncio.gather(
+            self._insert_batched(CollectedPost, collected_data.get("posts", []), "post", self.POST_KEY_FIELDS),
+            self._insert_batched(CollectedConnection, collected_data.get("connections", []), "connection",
+                                 self.CONNECTION_KEY_FIELDS),
+            self._insert_batched(CollectedInteraction, collected_data.get("interactions", []), "interaction"),
+            self._insert_batched(SearchHistory, collected_data.get("search_histories", []), "search history"),
+        )
+
+        return {
+            "posts_saved": posts_saved,
+            "connections_saved": connections_saved,
+            "interactions_saved": interactions_saved,
+            "search_histories_saved": search_histories_saved
         }
 
-        # Save posts
-        for post_data in collected_data["posts"]:
-            try:
-                post = CollectedPost(**post_data)
-                await post.save()
-                saved_counts["posts_saved"] += 1
-            except Exception as e:
-                logger.error(f"Error saving post: {e}")
+    async def _insert_batched(self, model_cls, items: List[Any], label: str,
+                              key_fields: Optional[Tuple[str, ...]] = None) -> int:
+        """Validate items into model_cls documents and write them in unordered batches.
+
+        Items may be raw dicts or documents the collector already built. With
+        key_fields, documents are upserted on those fields so re-syncs update
+        existing records instead of duplicating them. Returns the number of
+        documents written; invalid items and rejected writes are logged and
+        skipped without aborting the rest of the batch.
+        """
+        if len(items) > self.THREADED_VALIDATION_THRESHOLD:
+            # Keeps validation of big collections off the loop while other
+            # accounts' requests are still in flight
+            documents = await asyncio.to_thread(self._build_documents, model_cls, items, label)
+        else:
+            documents = self._build_documents(model_cls, items, label)
 
-        # Save connections
-        for conn_data in collected_data["connections"]:
+        saved = 0
+        for start in range(0, len(documents), self.SAVE_BATCH_SIZE):
+            batch = documents[start:start + self.SAVE_BATCH_SIZE]
             try:
-                connection = CollectedConnection(**conn_data)
-                await connection.save()
-                saved_counts["connections_saved"] += 1
+                if key_fields:
+                    saved += await self._upsert_batch(model_cls, batch, key_fields)
+                else:
+                    await model_cls.insert_many(batch, ordered=False)
+                    saved += len(batch)
+            except BulkWriteError as e:
+                write_errors = e.details.get("writeErrors", [])
+                for error in write_errors:
+                    logger.error("Error saving %s: %s", label, error.get('errmsg'))
+                if key_fields:
+                    saved += e.details.get("nUpserted", 0) + e.details.get("nMatched", 0)
+                else:
+                    saved += len(batch) - len(write_errors)
             except Exception as e:
-                logger.error(f"Error saving connection: {e}")
+                logger.error("Error saving %s batch: %s", label, e)
 
-        # Save interactions
-        for interaction_data in collected_data["interactions"]:
-            try:
-                interaction = CollectedInteraction(**interaction_data)
-                await interaction.save()
-                saved_counts["interactions_saved"] += 1
-            except Exception as e:
-                logger.error(f"Error saving interaction: {e}")
+        return saved
 
-        # Save search histories
-        for search_data in collected_data["search_histories"]:
+    @staticmethod
+    def _build_documents(model_cls, items: List[Any], label: str) -> List[Any]:
+        """Validate items into model_cls documents, logging and skipping invalid ones"""
+        documents = []
+        for item in items:
             try:
-                search = SearchHistory(**search_data)
-                await search.save()
-                saved_counts["search_histories_saved"] += 1
+                documents.append(item if isinstance(item, model_cls) else model_cls(**item))
             except Exception as e:
-                logger.error(f"Error saving search history: {e}")
-
-        return saved_counts
+                logger.error("Error saving %s: %s", label, e)
+        return documents
+
+    @classmethod
+    async def _upsert_batch(cls, model_cls, batch: List[Any], key_fields: Tuple[str, ...]) -> int:
+        """Upsert one batch of documents keyed on key_fields.
+
+        Only fields the collector actually set are overwritten on a re-sync;
+        defaults and write-once fields are written when the document is first inserted.
+        """
+        excluded = {"id", "revision_id", *key_fields}
+        operations = []
+        for document in batch:
+            fields = document.model_dump(exclude=excluded)
+            updated = document.model_dump(exclude_unset=True, exclude=excluded | cls.WRITE_ONCE_FIELDS)
+            operations.append(UpdateOne(
+                {field: getattr(document, field) for field in key_fields},
+                {
+                    "$set": updated,
+                    "$setOnInsert": {field: value for field, value in fields.items() if field not in updated}
+                },
+                upsert=True
+            ))
+        result = await model_cls.get_motor_collection().bulk_write(operations, ordered=False)
+        return result.upserted_count + result.matched_count
 
     async def _collect_from_platform(self, account: SocialAccount) -> Dict[str, List[Dict[str, Any]]]:
         """Collect data from a specific platform using OAuth"""
+        async with self._account_semaphore:
+            await self._ensure_fresh_token(account)
+            return await self._dispatch_platform(account)
+
+    async def _ensure_fresh_token(self, account: SocialAccount):
+        """Refresh an expiring access token; OAuthService coalesces concurrent refreshes per account"""
+        if not account.refresh_token or account.token_expires_at is None:
+            return
+        if account.token_expires_at - datetime.utcnow() > self.TOKEN_REFRESH_MARGIN:
+            return
+        if self.oauth_service is None:
+            logger.warning("No OAuth service to refresh the %s token for %s", account.platform.value, account.username)
+            return
+
+        # On success the service updates account.access_token in place
+        await self.oauth_service.refresh_token(account)
+
+    async def _dispatch_platform(self, account: SocialAccount) -> Dict[str, List[Dict[str, Any]]]:
+        """Route an account to its platform collector"""
 
         platform = account.platform.value
 
-        if platform == "facebook":
-            return await self._collect_facebook_data(account)
-        elif platform == "reddit":
-            return await self._collect_reddit_data(account)
-        elif platform == "youtube":
-            return await self._collect_youtube_data(account)
-        else:
-            logger.warning(f"Unsupported platform: {platform}")
-            return {"posts": [], "connections": [], "interactions": [], "search_histories": []}
+        collector = self._platform_collectors.get(platform)
+        if collector is None:
+            logger.warning("Unsupported platform: %s", platform)
+            return _empty_sections()
+        return await collector(account)
+
+    async def _collect_sections(self, account: SocialAccount, label: str, collect_posts: Callable,
+                                collect_connections: Callable, collect_interactions: Callable) -> Dict[str, List[Dict[str, Any]]]:
+        """Fetch a platform's posts, connections and interactions concurrently.
+
+        The endpoints are independent, so one failing section is logged and
+        left empty without discarding the others.
+        """
+        data = _empty_sections()
+
+        sections = {"interactions": collect_interactions(account)}
+        if account.collect_posts:
+            sections["posts"] = collect_posts(account)
+        if account.collect_connections:
+            sections["connections"] = collect_connections(account)
+
+        results = await asyncio.gather(*sections.values(), return_exceptions=True)
+        for key, result in zip(sections, results):
+            if isinstance(result, Exception):
+                logger.error("Error collecting %s %s: %s", label, key, result)
+            else:
+                data[key] = result
+
+        return data
 
+    @_safeplatform("Facebook", fallback=_empty_sections)
     async def _collect_facebook_data(self, account: SocialAccount) -> Dict[str, List[Dict[str, Any]]]:
         """Collect data from Facebook using Graph API"""
-        data = {"posts": [], "connections": [], "interactions": [], "search_histories": []}
-
-        try:
-            # Use Facebook Graph API collector for reliable data collection
-            collector = FacebookGraphAPICollector(
-                app_id=get_settings().FACEBOOK_CLIENT_ID,
-                app_secret=get_settings().FACEBOOK_CLIENT_SECRET,
-                access_token=account.access_token
-            )
-
-            # Collect comprehensive user data
-            user_data = collector.collect_comprehensive_user_data()
-
-            # Process posts
-            for post in user_data.get("posts", []):
-                data["posts"].append({
-                    "platform": "facebook",
-                    "post_id": post.get("id"),
-                    "content": post.get("message", ""),
-                    "created_at": post.get("created_time"),
-                    "url": post.get("permalink_url"),
-                    "likes_count": post.get("reactions", {}).get("summary", {}).get("total_count", 0),
-                    "comments_count": post.get("comments", {}).get("summary", {}).get("total_count", 0),
-                    "shares_count": post.get("shares", {}).get("count", 0) if post.get("shares") else 0,
-                    "attachments": post.get("attachments", {}).get("data", []),
-                    "account_id": str(account.id)
-                })
+        data = _empty_sections()
 
-            # Process friends/connections
-            for friend in user_data.get("friends", []):
-                data["connections"].append({
-                    "platform": "facebook",
-                    "connection_type": "friend",
-                    "target_user_id": friend.get("id"),
-                    "target_username": friend.get("name"),
-                    "target_profile_url": f"https://facebook.com/{friend.get('id')}",
-                    "relationship": "friend",
-                    "account_id": str(account.id)
-                })
+        # Use Facebook Graph API collector for reliable data collection
+        collector = FacebookGraphAPICollector(
+            app_id=oauth_settings.FACEBOOK_CLIENT_ID,
+            app_secret=oauth_settings.FACEBOOK_CLIENT_SECRET,
+            access_token=account.access_token
+        )
 
-            # Process photos
-            for photo in user_data.get("photos", []):
-                data["posts"].append({
-                    "platform": "facebook",
-                    "post_id": photo.get("id"),
-                    "content": photo.get("name", ""),
-                    "created_at": photo.get("created_time"),
-                    "url": photo.get("source"),
-                    "media_type": "photo",
-                    "album": photo.get("album", {}).get("name"),
-                    "account_id": str(account.id)
-                })
-
-            logger.info(f"Successfully collected Facebook data for {account.username}: {len(data['posts'])} posts, {len(data['connections'])} connections")
+        # The Graph API client is blocking, so fetching and normalizing the
+        # payload both run in a worker thread to keep other collectors moving
+        try:
+            data.update(await asyncio.to_thread(_fetch_and_transform_fb, collector, str(account.id)))
+        finally:
+            collector.session.close()
 
-        except Exception as e:
-            logger.error(f"Error in Facebook Graph API data collection: {e}")
+        logger.info("Successfully collected Facebook data for %s: %s posts, %s connections", account.username, len(data['posts']), len(data['connections']))
 
         return data
 
     async def _collect_instagram_data(self, account: SocialAccount) -> Dict[str, List[Dict[str, Any]]]:
         """Collect data from Instagram using Graph API"""
-        data = {"posts": [], "connections": [], "interactions": [], "search_histories": []}
-
-        try:
-            # Collect posts with comments and likes
-            if account.collect_posts:
-                posts_data = await self._collect_instagram_posts(account)
-                data["posts"].extend(posts_data)
-
-            # Collect connections (followers/following)
-            if account.collect_connections:
-                connections_data = await self._collect_instagram_connections(account)
-                data["connections"].extend(connections_data)
-
-            # Collect interactions
-            interactions_data = await self._collect_instagram_interactions(account)
-            data["interactions"].extend(interactions_data)
-
-        except Exception as e:
-            logger.error(f"Error collecting Instagram data: {e}")
-
-        return data
-
-    async def _collect_instagram_posts(self, account: SocialAccount) -> List[Dict[str, Any]]:
+        return await self._collect_sections(
+            account, "Instagram",
+            self._collect_instagram_posts,
+            self._collect_instagram_connections,
+            self._collect_instagram_interactions
+        )
+
+    @_safeplatform("Instagram")
+    async def _collect_instagram_posts(self, account: SocialAccount) -> List[CollectedPost]:
         """Collect posts with comments and likes from Instagram"""
         posts = []
 
-        try:
-            # Instagram Graph API endpoint for user's media
-            url = f"https://graph.instagram.com/me/media"
-            params = {
-                "access_token": account.access_token,
-                "fields": "id,media_type,media_url,permalink,caption,timestamp,like_count,comments_count",
-                "limit": 50
-            }
+        # Instagram Graph API endpoint for user's media
+        params = {**_INSTAGRAM_MEDIA_PARAMS, "access_token": account.access_token}
+
+        data = await self._get_json(_INSTAGRAM_MEDIA_URL, params=params)
+        if data is not None:
+            user_id = account.user_id
+            social_account_id = str(account.id)
+            platform = account.platform
+            for media in data.get("data", []):
+                media_type = media.get("media_type")
+                if media_type not in self.INSTAGRAM_POST_MEDIA_TYPES:
+                    continue
+                media_url = media.get("media_url")
+                try:
+                    posts.append(CollectedPost(
+                        user_id=user_id,
+                        social_account_id=social_account_id,
+                        platform=platform,
+                        platform_post_id=media["id"],
+                        content=media.get("caption", ""),
+                        post_url=media.get("permalink", ""),
+                        created_at=parse_timestamp(media["timestamp"]),
+                        likes_count=media.get("like_count", 0),
+                        comments_count=media.get("comments_count", 0),
+                        media_urls=[media_url] if media_url else [],
+                        media_type=media_type
+                    ))
+                except Exception as e:
+                    # Validation happens here, so one bad item doesn't drop the page
+                    logger.error("Error parsing Instagram media %s: %s", media.get('id'), e)
 
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-
-                    for media in data.get("data", []):
-                        if media.get("media_type") in ["IMAGE", "CAROUSEL_ALBUM", "VIDEO"]:
-                            post_data = {
-                                "user_id": account.user_id,
-                                "social_account_id": str(account.id),
-                                "platform": account.platform,
-                                "platform_post_id": media["id"],
-                                "content": media.get("caption", ""),
-                                "post_url": media.get("permalink", ""),
-                                "created_at": datetime.fromisoformat(media["timestamp"].replace('Z', '+00:00')),
-                                "likes_count": media.get("like_count", 0),
-                                "comments_count": media.get("comments_count", 0),
-                                "media_urls": [media.get("media_url")] if media.get("media_url") else [],
-                                "likes": [],  # Placeholder
-                                "comments": [],  # Placeholder
-                                "raw_data": media
-                            }
-                            posts.append(post_data)
-
-        except Exception as e:
-            logger.error(f"Error collecting Instagram data: {e}")
+        return posts
 
     async def _collect_reddit_data(self, account: SocialAccount) -> Dict[str, List[Dict[str, Any]]]:
         """Collect data from Reddit using API"""
-        data = {"posts": [], "connections": [], "interactions": [], "search_histories": []}
-
-        try:
-            # Collect posts with comments and likes
-            if account.collect_posts:
-                posts_data = await self._collect_reddit_posts(account)
-                data["posts"].extend(posts_data)
-
-            # Collect connections (subreddits, friends)
-            if account.collect_connections:
-                connections_data = await self._collect_reddit_connections(account)
-                data["connections"].extend(connections_data)
-
-            # Collect interactions
-            interactions_data = await self._collect_reddit_interactions(account)
-            data["interactions"].extend(interactions_data)
-
-        except Exception as e:
-            logger.error(f"Error collecting Reddit data: {e}")
-
-        return data
-
+        return await self._collect_sections(
+            account, "Reddit",
+            self._collect_reddit_posts,
+            self._collect_reddit_connections,
+            self._collect_reddit_interactions
+        )
+
+    @_safeplatform("Reddit")
     async def _collect_reddit_posts(self, account: SocialAccount) -> List[Dict[str, Any]]:
         """Collect posts with comments and likes from Reddit"""
         posts = []
 
-        try:
-            # Reddit API endpoint for user's posts - use username instead of 'me'
-            username = account.username
-            url = f"https://oauth.reddit.com/user/{username}/submitted"
-            headers = {
-                "Authorization": f"bearer {account.access_token}",
-                "User-Agent": "OSINT-Platform/1.0"
-            }
-            params = {
-                "limit": 50,
-                "sort": "new"
-            }
-
-            print(f"Reddit API URL: {url}")
-            print(f"Reddit Username: {username}")
-            print(f"Access Token Present: {bool(account.access_token)}")
+        # Reddit API endpoint for user's posts - use username instead of 'me'
+        username = account.username
+        url = f"https://oauth.reddit.com/user/{username}/submitted"
+        headers = {**_REDDIT_HEADERS, "Authorization": f"bearer {account.access_token}"}
+        params = _REDDIT_SUBMITTED_PARAMS
 
-            async with self.session.get(url, headers=headers, params=params) as response:
-                print(f"Reddit API Response Status: {response.status}")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Reddit API URL: %s (access token present: %s)", url, bool(account.access_token))
 
-                if response.status == 200:
-                    data = await response.json()
-                    print(f"Reddit API Response Data Keys: {list(data.keys()) if isinstance(data, dict) else 'Not a dict'}")
-                    print(f"Reddit Posts Found: {len(data.get('data', {}).get('children', []))}")
-
-                    for post in data.get("data", {}).get("children", []):
-                        post_data = post["data"]
-                        print(f"Processing post: {post_data.get('id')} - {post_data.get('title', '')[:50]}")
-                        post_obj = {
-                            "platform": PlatformEnum.REDDIT,
-                            "post_id": post_data["id"],
-                            "author": account.username,
-                            "author_username": account.username,
-                            "content": post_data.get("selftext", "") or post_data.get("title", ""),
-                            "url": f"https://reddit.com{post_data['permalink']}",
-                            "posted_at": datetime.fromtimestamp(post_data["created_utc"]),
-                            "engagement_metrics": {
-                                "score": post_data.get("score", 0),
-                                "comments": post_data.get("num_comments", 0)
-                            },
-                            "likes_count": post_data.get("score", 0),
-                            "comments_count": post_data.get("num_comments", 0),
-                            "collected_by": account.user_id,
-                            "threat_level": ThreatLevelEnum.LOW
-                        }
-                        posts.append(post_obj)
-                else:
-                    error_text = await response.text()
-                    print(f"Reddit API Error Response: {error_text}")
-                    print(f"Reddit API Headers: {dict(response.headers)}")
+        data = await self._get_json(url, params=params, headers=headers)
+        if data is not None:
+            children = data.get("data", {}).get("children", [])
+            if debug:
+                logger.debug("Reddit posts found for %s: %s", username, len(children))
 
-        except Exception as e:
-            logger.error(f"Error collecting Reddit data: {e}")
+            posts = [_reddit_post_dict(post["data"], account) for post in children]
 
         return posts
 
     async def _collect_youtube_data(self, account: SocialAccount) -> Dict[str, List[Dict[str, Any]]]:
         """Collect data from YouTube using API"""
-        data = {"posts": [], "connections": [], "interactions": [], "search_histories": []}
-
-        try:
-            # Collect videos with comments and likes
-            if account.collect_posts:
-                posts_data = await self._collect_youtube_posts(account)
-                data["posts"].extend(posts_data)
-
-            # Collect connections (subscriptions)
-            if account.collect_connections:
-                connections_data = await self._collect_youtube_connections(account)
-                data["connections"].extend(connections_data)
-
-            # Collect interactions
-            interactions_data = await self._collect_youtube_interactions(account)
-            data["interactions"].extend(interactions_data)
-
-        except Exception as e:
-            logger.error(f"Error collecting YouTube data: {e}")
-
-        return data
-
+        return await self._collect_sections(
+            account, "YouTube",
+            self._collect_youtube_posts,
+            self._collect_youtube_connections,
+            self._collect_youtube_interactions
+        )
+
+    @_safeplatform("YouTube")
     async def _collect_youtube_posts(self, account: SocialAccount) -> List[Dict[str, Any]]:
         """Collect videos with comments and likes from YouTube"""
         posts = []
 
-        try:
-            # YouTube API endpoint for user's videos
-            url = "https://www.googleapis.com/youtube/v3/search"
-            params = {
-                "part": "snippet",
-                "forMine": "true",
-                "type": "video",
-                "maxResults": 50,
-                "key": get_settings().YOUTUBE_API_KEY  # Would need to be configured
-            }
-            headers = {
-                "Authorization": f"Bearer {account.access_token}"
-            }
+        # YouTube API endpoint for user's videos
+        params = {**_YOUTUBE_SEARCH_PARAMS, "key": oauth_settings.YOUTUBE_API_KEY}  # Key would need to be configured
+        headers = {"Authorization": f"Bearer {account.access_token}"}
 
-            async with self.session.get(url, headers=headers, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-
-                    for item in data.get("items", []):
-                        video = item["snippet"]
-                        post_data = {
-                            "platform": PlatformEnum.YOUTUBE,
-                            "post_id": item["id"]["videoId"],
-                            "author": account.username,
-                            "author_username": account.username,
-                            "content": video.get("description", ""),
-                            "url": f"https://youtube.com/watch?v={item['id']['videoId']}",
-                            "posted_at": datetime.fromisoformat(video["publishedAt"].replace('Z', '+00:00')),
-                            "media_urls": [video.get("thumbnails", {}).get("default", {}).get("url", "")],
-                            "collected_by": account.user_id,
-                            "threat_level": ThreatLevelEnum.LOW
-                        }
-                        posts.append(post_data)
-
-        except Exception as e:
-            logger.error(f"Error collecting YouTube data: {e}")
+        data = await self._get_json(_YOUTUBE_SEARCH_URL, params=params, headers=headers)
+        if data is not None:
+            items = data.get("items", [])
+            statistics = await self._fetch_youtube_statistics(
+                [item["id"]["videoId"] for item in items], params["key"], headers
+            )
+            for item in items:
+                video = item["snippet"]
+                video_id = item["id"]["videoId"]
+                try:
+                    thumbnail_url = video["thumbnails"]["default"]["url"]
+                except KeyError:
+                    thumbnail_url = ""
+                post_data = {
+                    "platform": PlatformEnum.YOUTUBE,
+                    "post_id": video_id,
+                    "author": account.username,
+                    "author_username": account.username,
+                    "content": video.get("description", ""),
+                    "url": f"https://youtube.com/watch?v={video_id}",
+                    "posted_at": parse_timestamp(video["publishedAt"]),
+                    "media_urls": [thumbnail_url],
+                    "collected_by": account.user_id,
+                    "threat_level": ThreatLevelEnum.LOW
+                }
+                stats = statistics.get(video_id)
+                if stats:
+                    likes = int(stats.get("likeCount", 0))
+                    comments = int(stats.get("commentCount", 0))
+                    post_data["engagement_metrics"] = {
+                        "views": int(stats.get("viewCount", 0)),
+                        "likes": likes,
+                        "comments": comments
+                    }
+                    post_data["likes_count"] = likes
+                    post_data["comments_count"] = comments
+                posts.append(post_data)
 
         return posts
 
+    async def _fetch_youtube_statistics(self, video_ids: List[str], api_key: str,
+                                        headers: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """Statistics for up to 50 videos per videos.list call, keyed by video id"""
+        statistics = {}
+        for start in range(0, len(video_ids), 50):
+            params = {
+                "part": "statistics",
+                "id": ",".join(video_ids[start:start + 50]),
+                "key": api_key
+            }
+            data = await self._get_json(_YOUTUBE_VIDEOS_URL, params=params, headers=headers)
+            if data is not None:
+                for item in data.get("items", []):
+                    statistics[item["id"]] = item.get("statistics", {})
+        return statistics
+
     # Placeholder methods for additional data collection
     async def _collect_facebook_connections(self, account: SocialAccount) -> List[Dict[str, Any]]:
         """Collect Facebook friends/connections - Note: user_friends permission is deprecated"""
         # Facebook no longer allows access to user's friends list via API
         # The user_friends permission was deprecated and is no longer available
-        logger.info(f"Facebook connections collection not available due to API restrictions for account {account.username}")
+        logger.info("Facebook connections collection not available due to API restrictions for account %s", account.username)
         return []
 
     async def _collect_facebook_interactions(self, account: SocialAccount) -> List[Dict[str, Any]]:
         """Collect Facebook interactions (likes, comments, shares) - Limited due to API restrictions"""
         # Facebook API has restrictions on collecting user interactions
         # Individual likes/comments on others' posts are not accessible via API
-        logger.info(f"Facebook interactions collection limited due to API restrictions for account {account.username}")
+        logger.info("Facebook interactions collection limited due to API restrictions for account %s", account.username)
         return []
 
     async def _collect_facebook_search_history(self, account: SocialAccount) -> List[Dict[str, Any]]:
         """Collect Facebook search history - Not available via API"""
         # Facebook does not provide search history via their Graph API
-        logger.info(f"Facebook search history not available via API for account {account.username}")
+        logger.info("Facebook search history not available via API for account %s", account.username)
         return []
 
     # Similar placeholder methods would be needed for other platforms
+    async def _collect_instagram_connections(self, account: SocialAccount) -> List[Dict[str, Any]]:
+        return []
+
+    async def _collect_instagram_interactions(self, account: SocialAccount) -> List[Dict[str, Any]]:
+        return []
+
     async def _collect_reddit_connections(self, account: SocialAccount) -> List[Dict[str, Any]]:
         return []
 
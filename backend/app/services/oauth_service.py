@@ -7,7 +7,9 @@ import base64
 import asyncio
 import os
 import hashlib
-from typing import Dict, Optional, Tuple
+import orjson
+from cachetools import TTLCache
+from typing import Dict, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from urllib.parse import urlencode, parse_qs
 
@@ -16,14 +18,210 @@ from app.core.oauth_config import oauth_settings
 from app.core.mongodb import get_database
 from app.models.social_auth_models import SocialAccount, OAuthState, PlatformType
 from app.core.oauth_config import PLATFORM_CONFIGS
-from app.services import oauth_data_collector
+from app.services.oauth_data_collector import oauth_data_collector
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Per-platform credentials and scope strings, resolved once at import
+_CLIENT_IDS = {
+    "facebook": oauth_settings.FACEBOOK_CLIENT_ID,
+    "instagram": oauth_settings.INSTAGRAM_CLIENT_ID,
+    "reddit": oauth_settings.REDDIT_CLIENT_ID,
+    "twitter": oauth_settings.TWITTER_CLIENT_ID,
+}
+
+_CLIENT_SECRETS = {
+    "facebook": oauth_settings.FACEBOOK_CLIENT_SECRET,
+    "instagram": oauth_settings.INSTAGRAM_CLIENT_SECRET,
+    "reddit": oauth_settings.REDDIT_CLIENT_SECRET,
+    "twitter": oauth_settings.TWITTER_CLIENT_SECRET,
+}
+
+_REDIRECT_URIS = {
+    "facebook": oauth_settings.FACEBOOK_REDIRECT_URI,
+    "instagram": oauth_settings.INSTAGRAM_REDIRECT_URI,
+    "reddit": oauth_settings.REDDIT_REDIRECT_URI,
+    "twitter": oauth_settings.TWITTER_REDIRECT_URI,
+}
+
+# Basic auth headers for the providers that authenticate token requests that way
+_BASIC_AUTH = {
+    platform: "Basic " + base64.b64encode(f"{_CLIENT_IDS[platform]}:{_CLIENT_SECRETS[platform]}".encode()).decode()
+    for platform in ("reddit", "twitter")
+}
+
+_SCOPES = {platform: " ".join(config["scopes"]) for platform, config in PLATFORM_CONFIGS.items()}
+
+# Platform-specific authorization parameters
+_AUTH_EXTRA_PARAMS = {
+    "reddit": {"duration": "permanent"}
+}
+
+# Authorization URLs up to the per-request state (and Twitter's PKCE challenge)
+_AUTH_URL_PREFIXES = {
+    platform: config["auth_url"] + "?" + urlencode({
+        "client_id": _CLIENT_IDS[platform],
+        "redirect_uri": _REDIRECT_URIS[platform],
+        "scope": _SCOPES[platform],
+        "response_type": "code",
+        **_AUTH_EXTRA_PARAMS.get(platform, {})
+    })
+    for platform, config in PLATFORM_CONFIGS.items()
+}
+
+_FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+# Platform-specific profile endpoints, joined onto each API base once
+_PROFILE_ENDPOINTS = {
+    "facebook": "/me?fields=id,name,email,picture.width(200).height(200)",
+    "instagram": "/me?fields=id,username,name,account_type,media_count,followers_count,follows_count,biography,website,profile_picture_url",
+    "reddit": "/api/v1/me",
+    # api_base already ends in /2
+    "twitter": "/users/me?user.fields=id,username,name,profile_image_url,public_metrics,verified,description,location"
+}
+
+_PROFILE_URLS = {
+    platform: PLATFORM_CONFIGS[platform]["api_base"] + endpoint
+    for platform, endpoint in _PROFILE_ENDPOINTS.items()
+}
+
+# Marks a refresh outcome missing from the result cache (None is a cached failure)
+_NO_RESULT = object()
+
+# OAuth platform names that differ from their PlatformType enum values
+_DB_PLATFORM = {
+    "google": "youtube"
+}
+
+
+def _db_platform(platform: str) -> str:
+    return _DB_PLATFORM.get(platform, platform.lower())
+
+
+def _pkce_pair() -> Tuple[str, str]:
+    """Generate a PKCE (code_verifier, S256 code_challenge) pair"""
+    verifier = base64.urlsafe_b64encode(secrets.token_bytes(32)).rstrip(b"=").decode("ascii")
+    challenge = base64.urlsafe_b64encode(hashlib.sha256(verifier.encode("ascii")).digest()).rstrip(b"=").decode("ascii")
+    return verifier, challenge
+
+
+def _forget_when_done(inflight: Dict[str, asyncio.Future], key: str):
+    """Done-callback that drops a shared future from ``inflight`` and retrieves
+    its exception, so a failure whose waiters were all cancelled is not logged
+    as 'Task exception was never retrieved'"""
+    def done(future: asyncio.Future):
+        inflight.pop(key, None)
+        if not future.cancelled():
+            future.exception()
+    return done
+
+
+def _parse_facebook_profile(d: Dict) -> Dict:
+    return {
+        "user_id": d["id"],
+        "username": d.get("name", ""),
+        "display_name": d.get("name"),
+        "email": d.get("email"),
+        "profile_url": f"https://facebook.com/{d['id']}",
+        "profile_picture": d.get("picture", {}).get("data", {}).get("url")
+    }
+
+
+def _parse_instagram_profile(d: Dict) -> Dict:
+    return {
+        "user_id": d["id"],
+        "username": d.get("username", ""),
+        "display_name": d.get("name", ""),
+        "email": None,  # Instagram Basic Display API doesn't provide email
+        "profile_url": f"https://instagram.com/{d.get('username', d['id'])}",
+        "profile_picture": d.get("profile_picture_url")
+    }
+
+
+def _parse_reddit_profile(d: Dict) -> Dict:
+    return {
+        "user_id": d["id"],
+        "username": d["name"],
+        "display_name": d["name"],
+        "email": d.get("email"),
+        "profile_url": f"https://reddit.com/u/{d['name']}",
+        "profile_picture": d.get("icon_img", "").replace("&amp;", "&") if d.get("icon_img") else None
+    }
+
+
+def _parse_google_profile(d: Dict) -> Dict:
+    return {
+        "user_id": d["items"][0]["id"] if d.get("items") else "",
+        "username": d["items"][0]["snippet"]["title"] if d.get("items") else "",
+        "display_name": d["items"][0]["snippet"]["title"] if d.get("items") else "",
+        "profile_url": f"https://youtube.com/channel/{d['items'][0]['id']}" if d.get("items") else "",
+        "profile_picture": d["items"][0]["snippet"]["thumbnails"]["default"]["url"] if d.get("items") and d["items"][0]["snippet"].get("thumbnails") else None
+    }
+
+
+def _parse_twitter_profile(d: Dict) -> Dict:
+    return {
+        "user_id": d["data"]["id"],
+        "username": d["data"]["username"],
+        "display_name": d["data"]["name"],
+        "profile_url": f"https://twitter.com/{d['data']['username']}",
+        "profile_picture": d["data"].get("profile_image_url")
+    }
+
+
+# Platform profile payload -> common profile format
+_PROFILE_PARSERS = {
+    "facebook": _parse_facebook_profile,
+    "instagram": _parse_instagram_profile,
+    "reddit": _parse_reddit_profile,
+    "google": _parse_google_profile,
+    "twitter": _parse_twitter_profile,
+}
+
 class OAuthService:
+    __slots__ = (
+        "http_client", "_background_tasks", "_collect_semaphore",
+        "_refresh_inflight", "_inflight_callbacks", "_refresh_results"
+    )
+
+    # Seconds a refresh outcome is reused for the same account
+    REFRESH_RESULT_TTL = 5
+
+    # Post-callback collections allowed to run at once
+    MAX_CONCURRENT_COLLECTIONS = 8
+
     def __init__(self):
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+        # One pooled HTTP/2 client for every token, profile and refresh call,
+        # so repeat requests to the same provider skip the TCP/TLS handshake
+        self.http_client = httpx.AsyncClient(
+            # A stalled connect or pool wait fails fast; slow provider responses still get 30s
+            timeout=httpx.Timeout(connect=5.0, read=30.0, write=10.0, pool=5.0),
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=60),
+            headers={"User-Agent": "OSINT-Platform/1.0"}
+        )
+        # Strong references to post-callback collections until they finish
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._collect_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_COLLECTIONS)
+        # Token refreshes in flight and recently finished, keyed by account id
+        self._refresh_inflight: Dict[str, asyncio.Future] = {}
+        # Callbacks in flight keyed by a hash of (platform, code)
+        self._inflight_callbacks: Dict[str, asyncio.Future] = {}
+        self._refresh_results: TTLCache = TTLCache(maxsize=1024, ttl=self.REFRESH_RESULT_TTL)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """Cancel pending collections and close the HTTP client (called on application shutdown)"""
+        for task in self._background_tasks:
+            task.cancel()
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        await self.http_client.aclose()
     
     async def get_authorization_url(self, platform: str, user_id: str) -> Tuple[str, str]:
         """Generate OAuth authorization URL for a platform"""
@@ -41,33 +239,18 @@ class OAuthService:
             mock_url = f"http://localhost:3000/oauth-mock/{platform}?state={state}"
             return mock_url, state
         
-        config = PLATFORM_CONFIGS[actual_platform]
         state = secrets.token_urlsafe(32)
         
         # Generate code_verifier for Twitter PKCE
-        code_verifier = None
+        code_verifier = code_challenge = None
         if platform == "twitter":
-            code_verifier = secrets.token_urlsafe(32)
+            code_verifier, code_challenge = _pkce_pair()
         
         # Store state for security verification
         await self._store_oauth_state(state, user_id, platform, code_verifier)
         
-        client_id_map = {
-            "facebook": oauth_settings.FACEBOOK_CLIENT_ID,
-            "instagram": oauth_settings.INSTAGRAM_CLIENT_ID,
-            "reddit": oauth_settings.REDDIT_CLIENT_ID,
-            "twitter": oauth_settings.TWITTER_CLIENT_ID,
-        }
-        
-        redirect_uri_map = {
-            "facebook": oauth_settings.FACEBOOK_REDIRECT_URI,
-            "instagram": oauth_settings.INSTAGRAM_REDIRECT_URI,
-            "reddit": oauth_settings.REDDIT_REDIRECT_URI,
-            "twitter": oauth_settings.TWITTER_REDIRECT_URI,
-        }
-        
-        client_id = client_id_map.get(actual_platform)
-        redirect_uri = redirect_uri_map.get(actual_platform)
+        client_id = _CLIENT_IDS.get(actual_platform)
+        redirect_uri = _REDIRECT_URIS.get(actual_platform)
         
         if not client_id or client_id == f"your_{actual_platform}_client_id_here":
             raise ValueError(f"Client ID not configured for {platform}. Please set {actual_platform.upper()}_CLIENT_ID in your .env file")
@@ -75,27 +258,30 @@ class OAuthService:
         if not redirect_uri:
             raise ValueError(f"Redirect URI not configured for {platform}")
         
-        params = {
-            "client_id": client_id,
-            "redirect_uri": redirect_uri,
-            "scope": " ".join(config["scopes"]),
-            "state": state,
-            "response_type": "code"
-        }
-        
-        # Platform-specific parameters
-        if platform == "reddit":
-            params["duration"] = "permanent"
-        elif platform == "twitter":
-            params["code_challenge_method"] = "S256"
-            params["code_challenge"] = self._generate_code_challenge(code_verifier)
-        
-        auth_url = f"{config['auth_url']}?{urlencode(params)}"
+        # state and the PKCE challenge are URL-safe base64, so they need no quoting
+        auth_url = f"{_AUTH_URL_PREFIXES[actual_platform]}&state={state}"
+        if platform == "twitter":
+            auth_url += f"&code_challenge_method=S256&code_challenge={code_challenge}"
         
         return auth_url, state
     
     async def handle_callback(self, platform: str, code: str, state: str) -> Dict:
-        """Handle OAuth callback and exchange code for tokens"""
+        """Handle OAuth callback and exchange code for tokens.
+
+        A retried callback that arrives while the first is still running
+        shares its result instead of redeeming the single-use code again.
+        """
+        key = hashlib.sha256(f"{platform}:{code}".encode()).hexdigest()
+        callback = self._inflight_callbacks.get(key)
+        if callback is None:
+            callback = self._inflight_callbacks[key] = asyncio.ensure_future(
+                self._handle_callback(platform, code, state)
+            )
+            callback.add_done_callback(_forget_when_done(self._inflight_callbacks, key))
+        return await asyncio.shield(callback)
+    
+    async def _handle_callback(self, platform: str, code: str, state: str) -> Dict:
+        """Verify state, exchange the code and save the connected account"""
         # Verify state
         stored_data = await self._verify_oauth_state(state, platform)
         if not stored_data:
@@ -115,7 +301,7 @@ class OAuthService:
                     "token_type": "Bearer",
                     "expires_in": 3600,
                     "refresh_token": f"mock_refresh_token_{platform}_{user_id}",
-                    "scope": " ".join(PLATFORM_CONFIGS[platform]["scopes"])
+                    "scope": _SCOPES[platform]
                 }
                 
                 # Mock profile data
@@ -142,12 +328,10 @@ class OAuthService:
                 profile_data=profile_data
             )
             
-            # Trigger data collection for the new account
-            try:
-                collection_result = await oauth_data_collector.collect_data_for_user(user_id)
-                logger.info(f"Data collection completed for {platform}: {collection_result}")
-            except Exception as e:
-                logger.error(f"Data collection failed for {platform}: {e}")
+            # Collect data for the new account without holding up the redirect
+            task = asyncio.create_task(self._background_collect(user_id, platform))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
             
             return {
                 "success": True,
@@ -161,36 +345,28 @@ class OAuthService:
             logger.error(f"OAuth callback failed for {platform}: {e}")
             raise Exception(f"Authentication failed: {str(e)}")
     
+    async def _background_collect(self, user_id: str, platform: str):
+        """Run the initial data collection for a newly connected account.
+
+        A burst of OAuth completions queues here instead of starting an
+        unbounded number of collections at once.
+        """
+        async with self._collect_semaphore:
+            try:
+                collection_result = await oauth_data_collector.collect_data_for_user(user_id)
+                logger.info(f"Data collection completed for {platform}: {collection_result}")
+            except Exception as e:
+                logger.error(f"Data collection failed for {platform}: {e}")
+    
     async def _exchange_code_for_token(self, platform: str, code: str, code_verifier: Optional[str] = None) -> Dict:
         """Exchange authorization code for access token"""
         config = PLATFORM_CONFIGS[platform]
         
-        client_secret_map = {
-            "facebook": oauth_settings.FACEBOOK_CLIENT_SECRET,
-            "instagram": oauth_settings.INSTAGRAM_CLIENT_SECRET,
-            "reddit": oauth_settings.REDDIT_CLIENT_SECRET,
-            "twitter": oauth_settings.TWITTER_CLIENT_SECRET,
-        }
-        
-        client_id_map = {
-            "facebook": oauth_settings.FACEBOOK_CLIENT_ID,
-            "instagram": oauth_settings.INSTAGRAM_CLIENT_ID,
-            "reddit": oauth_settings.REDDIT_CLIENT_ID,
-            "twitter": oauth_settings.TWITTER_CLIENT_ID,
-        }
-        
-        redirect_uri_map = {
-            "facebook": oauth_settings.FACEBOOK_REDIRECT_URI,
-            "instagram": oauth_settings.INSTAGRAM_REDIRECT_URI,
-            "reddit": oauth_settings.REDDIT_REDIRECT_URI,
-            "twitter": oauth_settings.TWITTER_REDIRECT_URI,
-        }
-        
         data = {
-            "client_id": client_id_map[platform],
-            "client_secret": client_secret_map[platform],
+            "client_id": _CLIENT_IDS[platform],
+            "client_secret": _CLIENT_SECRETS[platform],
             "code": code,
-            "redirect_uri": redirect_uri_map[platform],
+            "redirect_uri": _REDIRECT_URIS[platform],
             "grant_type": "authorization_code"
         }
         
@@ -199,26 +375,22 @@ class OAuthService:
             data["code_verifier"] = code_verifier
         
         # Platform-specific headers and authentication
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        headers = dict(_FORM_HEADERS)
         
         if platform == "reddit":
             # Reddit requires basic auth
-            auth_string = f"{data['client_id']}:{data['client_secret']}"
-            encoded_auth = base64.b64encode(auth_string.encode()).decode()
-            headers["Authorization"] = f"Basic {encoded_auth}"
-            headers["User-Agent"] = "OSINT-Platform/1.0"
+            headers["Authorization"] = _BASIC_AUTH[platform]
             data.pop("client_secret")
         elif platform == "twitter":
             # Twitter OAuth 2.0 requires basic auth
-            auth_string = f"{data['client_id']}:{data['client_secret']}"
-            encoded_auth = base64.b64encode(auth_string.encode()).decode()
-            headers["Authorization"] = f"Basic {encoded_auth}"
+            headers["Authorization"] = _BASIC_AUTH[platform]
             data.pop("client_id")
             data.pop("client_secret")
         
+        # Pre-encoded so httpx sends the form body as-is
         response = await self.http_client.post(
             config["token_url"],
-            data=data,
+            content=urlencode(data).encode("ascii"),
             headers=headers
         )
         
@@ -226,7 +398,7 @@ class OAuthService:
             logger.error(f"Token exchange failed for {platform}: {response.status_code} - {response.text}")
             raise Exception(f"Token exchange failed: {response.status_code}")
         
-        token_data = response.json()
+        token_data = orjson.loads(response.content)
         
         # Validate required fields
         if "access_token" not in token_data:
@@ -236,79 +408,22 @@ class OAuthService:
     
     async def _get_user_profile(self, platform: str, access_token: str) -> Dict:
         """Get user profile from platform"""
-        config = PLATFORM_CONFIGS[platform]
         headers = {"Authorization": f"Bearer {access_token}"}
         
-        # Platform-specific headers
-        if platform == "reddit":
-            headers["User-Agent"] = "OSINT-Platform/1.0"
-        
-        # Platform-specific profile endpoints
-        profile_endpoints = {
-            "facebook": "/me?fields=id,name,email,picture.width(200).height(200)",
-            "instagram": "/me?fields=id,username,name,account_type,media_count,followers_count,follows_count,biography,website,profile_picture_url",
-            "reddit": "/api/v1/me",
-            "twitter": "/2/users/me?user.fields=id,username,name,profile_image_url,public_metrics,verified,description,location"
-        }
-        
-        endpoint = profile_endpoints[platform]
-        url = f"{config['api_base']}{endpoint}"
-        
-        response = await self.http_client.get(url, headers=headers)
+        response = await self.http_client.get(_PROFILE_URLS[platform], headers=headers)
         
         if response.status_code != 200:
             logger.error(f"Profile fetch failed for {platform}: {response.status_code} - {response.text}")
             raise Exception(f"Profile fetch failed: {response.status_code}")
         
-        profile_data = response.json()
+        profile_data = orjson.loads(response.content)
         
         # Parse platform-specific profile data
         return self._parse_profile_data(platform, profile_data)
     
     def _parse_profile_data(self, platform: str, profile_data: Dict) -> Dict:
         """Parse platform-specific profile data into common format"""
-        parsers = {
-            "facebook": lambda d: {
-                "user_id": d["id"],
-                "username": d.get("name", ""),
-                "display_name": d.get("name"),
-                "email": d.get("email"),
-                "profile_url": f"https://facebook.com/{d['id']}",
-                "profile_picture": d.get("picture", {}).get("data", {}).get("url")
-            },
-            "instagram": lambda d: {
-                "user_id": d["id"],
-                "username": d.get("username", ""),
-                "display_name": d.get("name", ""),
-                "email": None,  # Instagram Basic Display API doesn't provide email
-                "profile_url": f"https://instagram.com/{d.get('username', d['id'])}",
-                "profile_picture": d.get("profile_picture_url")
-            },
-            "reddit": lambda d: {
-                "user_id": d["id"],
-                "username": d["name"],
-                "display_name": d["name"],
-                "email": d.get("email"),
-                "profile_url": f"https://reddit.com/u/{d['name']}",
-                "profile_picture": d.get("icon_img", "").replace("&amp;", "&") if d.get("icon_img") else None
-            },
-            "google": lambda d: {
-                "user_id": d["items"][0]["id"] if d.get("items") else "",
-                "username": d["items"][0]["snippet"]["title"] if d.get("items") else "",
-                "display_name": d["items"][0]["snippet"]["title"] if d.get("items") else "",
-                "profile_url": f"https://youtube.com/channel/{d['items'][0]['id']}" if d.get("items") else "",
-                "profile_picture": d["items"][0]["snippet"]["thumbnails"]["default"]["url"] if d.get("items") and d["items"][0]["snippet"].get("thumbnails") else None
-            },
-            "twitter": lambda d: {
-                "user_id": d["data"]["id"],
-                "username": d["data"]["username"],
-                "display_name": d["data"]["name"],
-                "profile_url": f"https://twitter.com/{d['data']['username']}",
-                "profile_picture": d["data"].get("profile_image_url")
-            }
-        }
-        
-        parser = parsers.get(platform)
+        parser = _PROFILE_PARSERS.get(platform)
         if not parser:
             raise ValueError(f"No parser available for {platform}")
             
@@ -316,9 +431,7 @@ class OAuthService:
     
     async def _save_social_account(self, user_id: str, platform: str, token_data: Dict, profile_data: Dict) -> SocialAccount:
         """Save social account to database"""
-        # Map OAuth platform names to PlatformType enum values
-        platform_mapping = {}
-        db_platform = platform_mapping.get(platform, platform.lower())
+        db_platform = _db_platform(platform)
         
         # Calculate token expiration
         expires_at = None
@@ -333,18 +446,18 @@ class OAuthService:
         )
         
         if existing_account:
-            # Update existing account
-            existing_account.access_token = token_data["access_token"]
-            existing_account.refresh_token = token_data.get("refresh_token")
-            existing_account.token_expires_at = expires_at
-            existing_account.username = profile_data["username"]
-            existing_account.display_name = profile_data["display_name"]
-            existing_account.email = profile_data.get("email")
-            existing_account.profile_picture = profile_data.get("profile_picture")
-            existing_account.platform_data = token_data
-            existing_account.is_active = True
-            
-            await existing_account.save()
+            # Update existing account; $set sends only the refreshed fields
+            await existing_account.set({
+                SocialAccount.access_token: token_data["access_token"],
+                SocialAccount.refresh_token: token_data.get("refresh_token"),
+                SocialAccount.token_expires_at: expires_at,
+                SocialAccount.username: profile_data["username"],
+                SocialAccount.display_name: profile_data["display_name"],
+                SocialAccount.email: profile_data.get("email"),
+                SocialAccount.profile_picture: profile_data.get("profile_picture"),
+                SocialAccount.platform_data: token_data,
+                SocialAccount.is_active: True
+            })
             return existing_account
         
         # Create new account
@@ -368,99 +481,104 @@ class OAuthService:
     
     async def _store_oauth_state(self, state: str, user_id: str, platform: str, code_verifier: Optional[str] = None):
         """Store OAuth state for verification"""
-        # Map OAuth platform names to PlatformType enum values
-        platform_mapping = {
-            "google": "youtube"
-        }
-        db_platform = platform_mapping.get(platform, platform.lower())
+        db_platform = _db_platform(platform)
         
-        expires_at = datetime.utcnow() + timedelta(minutes=10)  # 10 minute expiry
+        now = datetime.utcnow()
         
-        oauth_state = OAuthState(
-            state=state,
-            user_id=user_id,
-            platform=PlatformType(db_platform),
-            code_verifier=code_verifier,
-            expires_at=expires_at
-        )
-        
-        await oauth_state.save()
+        # Every field is generated server-side, so the raw insert skips model validation;
+        # the platform lookup still rejects unknown platforms
+        await OAuthState.get_motor_collection().insert_one({
+            "state": state,
+            "user_id": user_id,
+            "platform": PlatformType(db_platform).value,
+            "code_verifier": code_verifier,
+            "created_at": now,
+            "expires_at": now + timedelta(minutes=10),  # 10 minute expiry
+            "is_used": False
+        })
     
     async def _verify_oauth_state(self, state: str, platform: str) -> Optional[Dict]:
         """Verify OAuth state and return stored data"""
-        # Map OAuth platform names to PlatformType enum values
-        platform_mapping = {
-            "google": "youtube"
-        }
-        db_platform = platform_mapping.get(platform, platform.lower())
-        
-        oauth_state = await OAuthState.find_one(
-            OAuthState.state == state,
-            OAuthState.platform == PlatformType(db_platform),
-            OAuthState.is_used == False,
-            OAuthState.expires_at > datetime.utcnow()
+        db_platform = _db_platform(platform)
+        
+        # Claim the state atomically so a replayed callback can never reuse it
+        oauth_state = await OAuthState.get_motor_collection().find_one_and_update(
+            {
+                "state": state,
+                "platform": PlatformType(db_platform).value,
+                "is_used": False,
+                "expires_at": {"$gt": datetime.utcnow()}
+            },
+            {"$set": {"is_used": True}},
+            projection={"user_id": 1, "platform": 1, "code_verifier": 1}
         )
         
         if not oauth_state:
             return None
         
-        # Mark state as used
-        oauth_state.is_used = True
-        await oauth_state.save()
-        
         return {
-            "user_id": oauth_state.user_id,
-            "platform": oauth_state.platform.value,
-            "code_verifier": oauth_state.code_verifier
+            "user_id": oauth_state["user_id"],
+            "platform": oauth_state["platform"],
+            "code_verifier": oauth_state.get("code_verifier")
         }
     
-    def _generate_code_challenge(self, code_verifier: str) -> str:
-        """Generate PKCE code challenge from code verifier"""
-        import hashlib
-        import base64
-        
-        # Create SHA256 hash of the code verifier
-        sha256 = hashlib.sha256(code_verifier.encode('utf-8')).digest()
-        
-        # Base64url encode the hash
-        code_challenge = base64.urlsafe_b64encode(sha256).decode('utf-8').rstrip('=')
-        
-        return code_challenge
-    
     async def refresh_token(self, social_account: SocialAccount) -> bool:
-        """Refresh access token for a social account"""
+        """Refresh access token for a social account.
+
+        Concurrent refreshes of the same account share one provider call, and
+        the outcome is reused for REFRESH_RESULT_TTL seconds afterwards.
+        """
         if not social_account.refresh_token:
             return False
         
+        key = str(social_account.id)
+        result = self._refresh_results.get(key, _NO_RESULT)
+        if result is _NO_RESULT:
+            refresh = self._refresh_inflight.get(key)
+            if refresh is None:
+                refresh = self._refresh_inflight[key] = asyncio.ensure_future(self._refresh_token(social_account))
+                refresh.add_done_callback(lambda _: self._refresh_inflight.pop(key, None))
+            result = await asyncio.shield(refresh)
+        
+        if result is None:
+            return False
+        
+        # Callers holding their own copy of the account pick up the new token too
+        social_account.access_token, social_account.token_expires_at = result
+        return True
+    
+    async def _refresh_token(self, social_account: SocialAccount) -> Optional[Tuple[str, Optional[datetime]]]:
+        """Call the provider's token endpoint, returning the new (access_token, expires_at) or None"""
         platform = social_account.platform.value
         config = PLATFORM_CONFIGS[platform]
+        result = None
         
         # Platform-specific refresh logic
         if platform in ["facebook", "instagram"]:
             try:
                 response = await self.http_client.post(
                     config["token_url"],
-                    data={
-                        "client_id": getattr(oauth_settings, f"{platform.upper()}_CLIENT_ID"),
-                        "client_secret": getattr(oauth_settings, f"{platform.upper()}_CLIENT_SECRET"),
+                    content=urlencode({
+                        "client_id": _CLIENT_IDS[platform],
+                        "client_secret": _CLIENT_SECRETS[platform],
                         "refresh_token": social_account.refresh_token,
                         "grant_type": "refresh_token"
-                    }
+                    }).encode("ascii"),
+                    headers=_FORM_HEADERS
                 )
                 
                 if response.status_code == 200:
-                    token_data = response.json()
+                    token_data = orjson.loads(response.content)
                     social_account.access_token = token_data["access_token"]
                     
                     if "expires_in" in token_data:
                         social_account.token_expires_at = datetime.utcnow() + timedelta(seconds=token_data["expires_in"])
                     
                     await social_account.save()
-                    return True
+                    result = (social_account.access_token, social_account.token_expires_at)
                     
             except Exception as e:
                 logger.error(f"Token refresh failed for {platform}: {e}")
-                
-        return False
-
-oauth_service = OAuthService()
\ No newline at end of file
+        
+        self._refresh_results[str(social_account.id)] = result
+        return result
\ No newline at end of file
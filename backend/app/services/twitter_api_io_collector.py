@@ -8,9 +8,11 @@ import logging
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 import httpx
+import orjson
 
 from app.models.mongo_models import SocialMediaPost, PlatformEnum
 from app.core.mongodb import get_database
+from app.core.timeutils import parse_timestamp
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +24,17 @@ class TwitterApiIOCollector:
         self.base_url = "https://api.twitterapi.io"
         self.session: Optional[httpx.AsyncClient] = None
 
+    @staticmethod
+    def _create_session() -> httpx.AsyncClient:
+        # HTTP/2 multiplexes the user-info and tweets requests over one connection
+        return httpx.AsyncClient(
+            timeout=30.0,
+            http2=True,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20)
+        )
+
     async def __aenter__(self):
-        self.session = httpx.AsyncClient(timeout=30.0)
+        self.session = self._create_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -33,7 +44,7 @@ class TwitterApiIOCollector:
     async def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
         """Make authenticated request to Twitter API IO"""
         if not self.session:
-            self.session = httpx.AsyncClient(timeout=30.0)
+            self.session = self._create_session()
 
         headers = {
             "X-API-Key": self.api_key,
@@ -47,7 +58,7 @@ class TwitterApiIOCollector:
                 params=params
             )
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except Exception as e:
             logger.error(f"Twitter API IO request failed: {e}")
             return None
@@ -185,6 +196,7 @@ class TwitterApiIOCollector:
         try:
             db = get_database()
             saved_count = 0
+            collected_at = datetime.utcnow()
 
             for tweet in tweets:
                 # Convert to SocialMediaPost format
@@ -193,14 +205,14 @@ class TwitterApiIOCollector:
                     "platform_id": str(tweet.get("id")),
                     "content": tweet.get("text", ""),
                     "author_username": tweet.get("username"),
-                    "created_at": datetime.fromisoformat(tweet.get("created_at").replace('Z', '+00:00')) if tweet.get("created_at") else datetime.utcnow(),
+                    "created_at": parse_timestamp(tweet.get("created_at"), collected_at),
                     "engagement_metrics": {
                         "likes": tweet.get("like_count", 0),
                         "retweets": tweet.get("retweet_count", 0),
                         "replies": tweet.get("reply_count", 0)
                     },
                     "metadata": {
-                        "collected_at": datetime.utcnow(),
+                        "collected_at": collected_at,
                         "source": "twitterapi.io"
                     }
                 }